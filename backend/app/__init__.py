@@ -1 +1,5 @@
 # This file makes app a Python package
+import time
+
+# Reference point for the startup timing report (app.startup)
+IMPORT_STARTED = time.perf_counter()
@@ -0,0 +1,115 @@
+"""
+Archival tier - move old completed tasks out of the hot tasks table
+
+    python -m app.archive schedule  # enqueue the next nightly run (worker --with-scheduler)
+    python -m app.archive run       # archive now, in this process
+"""
+
+import argparse
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import ArchivedTask, StatusEnum, Task
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Completed tasks untouched for this many days are archived
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+# UTC hour of the daily archival run
+ARCHIVE_HOUR_UTC = int(os.getenv("ARCHIVE_HOUR_UTC", "3"))
+
+ARCHIVED_COLUMNS = (
+    "id",
+    "user_id",
+    "title",
+    "description",
+    "priority",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+
+def next_run_at(now: datetime = None) -> datetime:
+    """Next ARCHIVE_HOUR_UTC o'clock after `now`"""
+    now = now or datetime.now(timezone.utc)
+    run_at = now.replace(hour=ARCHIVE_HOUR_UTC, minute=0, second=0, microsecond=0)
+    return run_at if run_at > now else run_at + timedelta(days=1)
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """
+    Move one batch of completed tasks last updated before `cutoff`, commit
+
+    A single statement: DELETE ... RETURNING feeds INSERT INTO tasks_archive,
+    so a task is never in both tables or in neither. Rows locked by a
+    concurrent update are skipped and picked up by a later run.
+    """
+    batch = (
+        select(Task.id)
+        .where(Task.status == StatusEnum.completed, Task.updated_at < cutoff)
+        .order_by(Task.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(Task)
+        .where(Task.id.in_(batch.scalar_subquery()))
+        .returning(*(getattr(Task, c) for c in ARCHIVED_COLUMNS))
+        .cte("moved")
+    )
+    result = db.execute(
+        insert(ArchivedTask).from_select(ARCHIVED_COLUMNS, select(moved))
+    )
+    db.commit()
+    return result.rowcount
+
+
+def archive_completed_tasks(
+    db: Session, older_than_days: int = None, batch_size: int = 1000
+) -> int:
+    """Archive batches until no eligible task is left, return how many moved"""
+    if older_than_days is None:
+        older_than_days = ARCHIVE_AFTER_DAYS
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+
+    archived = 0
+    while True:
+        moved = archive_batch(db, cutoff, batch_size)
+        archived += moved
+        if moved < batch_size:
+            return archived
+        logger.info(f"Archived {archived} tasks so far", extra={"archived": archived})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old completed tasks")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("schedule", help="Enqueue the next nightly run")
+    run_cmd = subcommands.add_parser("run", help="Archive now")
+    run_cmd.add_argument("--older-than-days", type=int, default=ARCHIVE_AFTER_DAYS)
+    run_cmd.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == "schedule":
+        from app.queue import schedule_archive
+
+        logger.info(f"Next archival run at {schedule_archive().isoformat()}")
+    elif args.command == "run":
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            archived = archive_completed_tasks(
+                db, args.older_than_days, args.batch_size
+            )
+            logger.info(f"Archived {archived} tasks", extra={"archived": archived})
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,10 @@
 Authentication - JWT and password hashing
 """
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -10,10 +14,12 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 import os
+import uuid
 from dotenv import load_dotenv
 
 from app.database import get_db
 from app.models import User
+from app.revocation import get_revocations
 
 load_dotenv()
 
@@ -23,6 +29,16 @@ SECRET_KEY = os.getenv(
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Verified tokens remembered per process (0 disables the decode cache)
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+
+# Comma-separated emails allowed to use /api/admin endpoints
+ADMIN_EMAILS = {
+    email.strip().lower()
+    for email in os.getenv("ADMIN_EMAILS", "").split(",")
+    if email.strip()
+}
+
 # Password hashing with pwdlib (modern replacement for passlib)
 # Uses Argon2id by default - OWASP recommended, memory-hard, GPU-resistant
 pwd_hash = PasswordHash.recommended()
@@ -45,21 +61,87 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """Create JWT token"""
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=30))
-    to_encode.update({"exp": expire})
+    # jti identifies the token for revocation (logout)
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+class DecodedTokenCache:
+    """
+    Bounded LRU of verified claims, keyed by a SHA-256 of the token
+    Entries are only served until the token's exp, so expiry is still
+    enforced; revocation is checked separately on every request.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, key: bytes, claims: dict) -> None:
+        if not isinstance(claims.get("exp"), (int, float)):
+            return  # no expiry, nothing safe to cache until
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = DecodedTokenCache(JWT_CACHE_SIZE)
+
+
+def decode_access_token(token: str) -> dict:
+    """Verify JWT signature and expiry, return its claims (raises JWTError)"""
+    if not token_cache.max_size:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(key)
+    if claims is None:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.put(key, claims)
+    return dict(claims)
+
+
+def decode_active_token(token: str) -> dict:
+    """decode_access_token, and reject revoked tokens too (raises JWTError)"""
+    payload = decode_access_token(token)
+    # Tokens issued before jti was added carry none and expire on their own
+    jti = payload.get("jti")
+    if jti and get_revocations().is_revoked(jti):
+        raise JWTError("Token has been revoked")
+    return payload
+
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """Get user from database"""
     return db.query(User).filter(User.email == email).first()
 
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
 ) -> User:
     """
     FastAPI dependency - extracts user from JWT token
     Use this to protect routes: def my_route(user: User = Depends(get_current_user))
+    A plain def, so FastAPI runs it in the threadpool: the revocation check
+    and the user lookup may block on Redis and the database.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -68,7 +150,7 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_active_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
@@ -80,3 +162,16 @@ async def get_current_user(
         raise credentials_exception
 
     return user
+
+
+def is_admin(email: Optional[str]) -> bool:
+    return bool(email) and email.lower() in ADMIN_EMAILS
+
+
+async def get_current_admin(user: User = Depends(get_current_user)) -> User:
+    """FastAPI dependency - like get_current_user, but only for ADMIN_EMAILS"""
+    if not is_admin(user.email):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
+        )
+    return user
@@ -0,0 +1,99 @@
+"""
+Response compression codecs and Accept-Encoding negotiation
+
+gzip is always available; Brotli (`brotli`) and zstd (`zstandard`) are used
+when their packages are installed. Task lists are mostly repeated keys and
+enum values, so even fast levels shrink them several-fold.
+"""
+
+import gzip
+import os
+from typing import Callable, Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+# Bodies smaller than this are sent as-is (headers + CPU outweigh the saving)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Bodies at least this large are compressed in the threadpool, off the loop
+COMPRESSION_THREADPOOL_SIZE = int(os.getenv("COMPRESSION_THREADPOOL_SIZE", "65536"))
+# Levels favour speed: most of the size win comes from the first levels
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def gzip_encode(body: bytes, level: int = None) -> bytes:
+    return gzip.compress(
+        body, compresslevel=GZIP_LEVEL if level is None else level, mtime=0
+    )
+
+
+def brotli_encode(body: bytes, level: int = None) -> bytes:
+    return brotli.compress(body, quality=BROTLI_QUALITY if level is None else level)
+
+
+def zstd_encode(body: bytes, level: int = None) -> bytes:
+    return zstandard.ZstdCompressor(
+        level=ZSTD_LEVEL if level is None else level
+    ).compress(body)
+
+
+def available_encoders() -> Dict[str, Callable[..., bytes]]:
+    """Installed codecs, in server preference order"""
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = zstd_encode
+    if brotli is not None:
+        encoders["br"] = brotli_encode
+    encoders["gzip"] = gzip_encode
+    return encoders
+
+
+ENCODERS = available_encoders()
+
+
+def choose_encoding(accept_encoding: str, encoders: Dict = None) -> Optional[str]:
+    """
+    Best encoding the client accepts, or None for identity
+    The client's q-values decide; server preference breaks ties.
+    """
+    encoders = ENCODERS if encoders is None else encoders
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip()] = q
+
+    best, best_q = None, 0.0
+    for coding in encoders:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
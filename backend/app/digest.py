@@ -0,0 +1,221 @@
+"""
+Scheduled per-user digests - one message per user per window
+
+Each batch of users is summarised with two set-based queries over tasks
+(counts, then the top tasks needing attention), never a query per task or
+per user. The run's position is checkpointed after every batch, so an
+interrupted run resumes after the last finished batch; at worst that batch's
+digests are sent twice.
+
+    python -m app.digest schedule   # enqueue the next run (worker --with-scheduler)
+    python -m app.digest run        # run (or resume) now, in this process
+"""
+
+import argparse
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.logging_config import get_logger
+from app.models import DigestRun, PriorityEnum, StatusEnum, Task, User
+
+logger = get_logger(__name__)
+
+# Hours between runs (and covered by one digest), and the UTC hour one of
+# the runs falls on - daily at DIGEST_HOUR_UTC by default
+DIGEST_INTERVAL_HOURS = int(os.getenv("DIGEST_INTERVAL_HOURS", "24"))
+DIGEST_HOUR_UTC = int(os.getenv("DIGEST_HOUR_UTC", "7"))
+# Open tasks untouched this long need attention (as do open high priority ones)
+DIGEST_STALE_DAYS = int(os.getenv("DIGEST_STALE_DAYS", "7"))
+DIGEST_BATCH_SIZE = int(os.getenv("DIGEST_BATCH_SIZE", "1000"))
+# Task titles listed per digest
+DIGEST_TOP_TASKS = 3
+
+
+def next_run_at(now: datetime = None) -> datetime:
+    """
+    First slot after `now` - slots are DIGEST_INTERVAL_HOURS apart, counted
+    from DIGEST_HOUR_UTC on 1970-01-01 so every run lands on the same grid
+    """
+    now = now or datetime.now(timezone.utc)
+    interval = timedelta(hours=DIGEST_INTERVAL_HOURS)
+    anchor = datetime(1970, 1, 1, DIGEST_HOUR_UTC, tzinfo=timezone.utc)
+    return anchor + ((now - anchor) // interval + 1) * interval
+
+
+def start_or_resume_run(db: Session, now: datetime = None) -> DigestRun:
+    """The unfinished run if there is one, else a new run since the last"""
+    run = db.execute(
+        select(DigestRun)
+        .where(DigestRun.finished_at.is_(None))
+        .order_by(DigestRun.started_at)
+        .limit(1)
+    ).scalar_one_or_none()
+    if run is not None:
+        logger.info(
+            f"Resuming digest run after user {run.last_user_id}",
+            extra={"digest_run_id": str(run.id), "users": run.users_processed},
+        )
+        return run
+
+    now = now or datetime.now(timezone.utc)
+    last_end = db.execute(select(func.max(DigestRun.window_end))).scalar()
+    run = DigestRun(
+        window_start=last_end or now - timedelta(hours=DIGEST_INTERVAL_HOURS),
+        window_end=now,
+    )
+    db.add(run)
+    db.commit()
+    return run
+
+
+def summarize_users(db: Session, run: DigestRun, user_ids: List) -> Dict:
+    """Created / changed / needs-attention counts and top tasks, per user"""
+    start, end = run.window_start, run.window_end
+    open_task = Task.status != StatusEnum.completed
+    needs_attention = and_(
+        open_task,
+        or_(
+            Task.priority == PriorityEnum.high,
+            Task.updated_at < end - timedelta(days=DIGEST_STALE_DAYS),
+        ),
+    )
+
+    counts = db.execute(
+        select(
+            Task.user_id,
+            func.count()
+            .filter(Task.created_at >= start, Task.created_at < end)
+            .label("created"),
+            func.count()
+            .filter(
+                Task.created_at < start,
+                Task.updated_at >= start,
+                Task.updated_at < end,
+            )
+            .label("changed"),
+            func.count().filter(needs_attention).label("attention"),
+        )
+        .where(Task.user_id.in_(user_ids))
+        .group_by(Task.user_id)
+    ).all()
+    summaries = {
+        row.user_id: {
+            "created": row.created,
+            "changed": row.changed,
+            "attention": row.attention,
+            "top_tasks": [],
+        }
+        for row in counts
+        if row.created or row.changed or row.attention
+    }
+    if not summaries:
+        return summaries
+
+    ranked = (
+        select(
+            Task.user_id,
+            Task.title,
+            func.row_number()
+            .over(
+                partition_by=Task.user_id,
+                order_by=(Task.priority.desc(), Task.updated_at),
+            )
+            .label("rank"),
+        )
+        .where(Task.user_id.in_(list(summaries)), needs_attention)
+        .subquery()
+    )
+    for user_id, title in db.execute(
+        select(ranked.c.user_id, ranked.c.title).where(
+            ranked.c.rank <= DIGEST_TOP_TASKS
+        )
+    ):
+        summaries[user_id]["top_tasks"].append(title)
+    return summaries
+
+
+def send_digest(email: str, full_name: str, summary: Dict) -> None:
+    """
+    Deliver one digest
+    In production, this would hand the message to an email service in bulk
+    """
+    logger.debug(
+        f"Digest for {email}: {summary['created']} created, "
+        f"{summary['changed']} changed, {summary['attention']} need attention",
+        extra={"user_email": email, **summary},
+    )
+
+
+def digest_batch(db: Session, run: DigestRun, batch_size: int) -> int:
+    """Send digests to the next batch of users and checkpoint, return its size"""
+    query = (
+        select(User.id, User.email, User.full_name)
+        .where(User.is_active.is_(True))
+        .order_by(User.id)
+        .limit(batch_size)
+    )
+    if run.last_user_id is not None:
+        query = query.where(User.id > run.last_user_id)
+    users = db.execute(query).all()
+    if not users:
+        return 0
+
+    summaries = summarize_users(db, run, [user.id for user in users])
+    for user in users:
+        if user.id in summaries:
+            send_digest(user.email, user.full_name, summaries[user.id])
+
+    run.last_user_id = users[-1].id
+    run.users_processed += len(users)
+    run.digests_sent += len(summaries)
+    db.commit()
+    return len(users)
+
+
+def run_digest(db: Session, batch_size: int = None) -> Dict:
+    """Run (or resume) a digest over all active users"""
+    batch_size = batch_size or DIGEST_BATCH_SIZE
+    run = start_or_resume_run(db)
+
+    while digest_batch(db, run, batch_size) == batch_size:
+        logger.info(
+            f"Digests: {run.users_processed} users processed",
+            extra={"digest_run_id": str(run.id), "digests_sent": run.digests_sent},
+        )
+
+    run.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    return {
+        "digest_run_id": str(run.id),
+        "users_processed": run.users_processed,
+        "digests_sent": run.digests_sent,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-user task digests")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("schedule", help="Enqueue the next scheduled run")
+    run_cmd = subcommands.add_parser("run", help="Run or resume a digest now")
+    run_cmd.add_argument("--batch-size", type=int, default=DIGEST_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.command == "schedule":
+        from app.queue import schedule_digest
+
+        logger.info(f"Next digest run at {schedule_digest().isoformat()}")
+    elif args.command == "run":
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            logger.info("Digest run finished", extra=run_digest(db, args.batch_size))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Idempotency-Key support for unsafe requests (POST /api/tasks)
+
+The first request with a given (user, key) claims the key in Redis with an
+in-flight marker, runs, and stores its response for IDEMPOTENCY_TTL seconds.
+Retries get the stored response back (Idempotent-Replayed: true) without
+writing to the database or the queue; a retry that arrives while the
+original is still running waits for it instead of running again. Failed
+requests are not stored, so they can be retried.
+
+The key is claimed by the idempotency_key dependency, which only needs the
+JWT: routes declare it before get_current_user, so a waiting duplicate holds
+neither a DB connection nor a threadpool thread.
+
+Without Redis the request simply runs (fail open), as if no key was sent.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from typing import Any, Callable, Optional
+import orjson
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.responses import Response
+from jose import JWTError
+from redis.exceptions import RedisError
+from starlette.concurrency import run_in_threadpool
+
+from app.auth import decode_access_token, oauth2_scheme
+from app.logging_config import get_logger
+from app.serialization import json_response
+
+logger = get_logger(__name__)
+
+# How long a stored response is replayed
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+# In-flight marker lifetime: bounds how long a crashed request blocks its key
+IDEMPOTENCY_LOCK_TTL_MS = int(os.getenv("IDEMPOTENCY_LOCK_TTL_MS", "30000"))
+# How long a duplicate waits for the original before giving up with 409
+IDEMPOTENCY_WAIT_MS = int(os.getenv("IDEMPOTENCY_WAIT_MS", "10000"))
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyConflict(Exception):
+    """Key reused with a different request body"""
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable hash of the request body (key order does not matter)"""
+    return hashlib.sha256(
+        orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    One Redis key per (scope, key): an in-flight marker claimed with SET NX,
+    replaced by the stored response once the request completes
+    """
+
+    def __init__(
+        self,
+        redis_conn,
+        ttl: int = None,
+        lock_ttl_ms: int = None,
+        wait_ms: int = None,
+        poll_ms: int = 20,
+        prefix: str = "idempotency",
+    ):
+        self.redis = redis_conn
+        self.ttl = ttl or IDEMPOTENCY_TTL
+        self.lock_ttl_ms = lock_ttl_ms or IDEMPOTENCY_LOCK_TTL_MS
+        self.wait_ms = IDEMPOTENCY_WAIT_MS if wait_ms is None else wait_ms
+        self.poll_ms = poll_ms
+        self.prefix = prefix
+
+    def _key(self, scope: str, key: str) -> str:
+        return f"{self.prefix}:{scope}:{key}"
+
+    def claim(self, scope: str, key: str, request_hash: str, owner: str):
+        """
+        One attempt: ("run", None) if `owner` claimed the key, ("replay",
+        record) once the original has completed, ("wait", None) meanwhile
+        """
+        redis_key = self._key(scope, key)
+        marker = orjson.dumps({"fingerprint": request_hash, "owner": owner})
+        if self.redis.set(redis_key, marker, nx=True, px=self.lock_ttl_ms):
+            return "run", None
+        raw = self.redis.get(redis_key)
+        if raw is None:
+            return "wait", None  # original failed and released the key
+        record = orjson.loads(raw)
+        if record["fingerprint"] != request_hash:
+            raise IdempotencyConflict(key)
+        if "status" in record:
+            return "replay", record
+        return "wait", None
+
+    def complete(
+        self, scope: str, key: str, request_hash: str, status_code: int, body: bytes
+    ) -> None:
+        record = {
+            "fingerprint": request_hash,
+            "status": status_code,
+            "body": body.decode(),
+        }
+        self.redis.set(self._key(scope, key), orjson.dumps(record), ex=self.ttl)
+
+    def release(self, scope: str, key: str, owner: str) -> None:
+        """Drop our in-flight marker (not someone else's, if ours expired)"""
+        redis_key = self._key(scope, key)
+
+        def delete_if_ours(pipe):
+            raw = pipe.get(redis_key)
+            if raw is not None and orjson.loads(raw).get("owner") == owner:
+                pipe.multi()
+                pipe.delete(redis_key)
+
+        self.redis.transaction(delete_if_ours, redis_key)
+
+
+_store: Optional[IdempotencyStore] = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    global _store
+    if _store is None:
+        from app.redis_client import get_redis
+
+        _store = IdempotencyStore(get_redis())
+    return _store
+
+
+class Idempotency:
+    """
+    The request's claim on its key. respond() replays the stored response,
+    or runs fn() and stores what it returns. Without a claim (no key sent,
+    Redis down) it just runs fn().
+    """
+
+    def __init__(
+        self,
+        store: IdempotencyStore = None,
+        scope: str = None,
+        key: str = None,
+        request_hash: str = None,
+    ):
+        self.store = store
+        self.scope = scope
+        self.key = key
+        self.request_hash = request_hash
+        self.owner: Optional[str] = None
+        self.record: Optional[dict] = None
+        self.completed = False
+
+    def respond(
+        self, fn: Callable[[], bytes], status_code: int = status.HTTP_201_CREATED
+    ) -> Response:
+        if self.record is not None:
+            response = json_response(
+                self.record["body"].encode(), self.record["status"]
+            )
+            response.headers[REPLAYED_HEADER] = "true"
+            return response
+
+        body = fn()
+        if self.owner is not None:
+            try:
+                self.store.complete(
+                    self.scope, self.key, self.request_hash, status_code, body
+                )
+                self.completed = True
+            except RedisError as e:
+                logger.warning(f"Failed to store idempotent response: {e}")
+        return json_response(body, status_code)
+
+    def release(self) -> None:
+        """Let a retry run again if this request did not complete"""
+        if self.owner is None or self.completed:
+            return
+        try:
+            self.store.release(self.scope, self.key, self.owner)
+        except RedisError as e:
+            logger.warning(f"Failed to release idempotency key: {e}")
+
+    async def acquire(self) -> None:
+        """Claim the key, or wait (without a thread) for the original"""
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + self.store.wait_ms / 1000
+        while True:
+            outcome, record = await run_in_threadpool(
+                self.store.claim, self.scope, self.key, self.request_hash, owner
+            )
+            if outcome == "run":
+                self.owner = owner
+                return
+            if outcome == "replay":
+                self.record = record
+                return
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still in progress",
+                    headers={"Retry-After": "1"},
+                )
+            await asyncio.sleep(self.store.poll_ms / 1000)
+
+
+async def request_fingerprint(request: Request) -> str:
+    body = await request.body()
+    try:
+        return fingerprint(orjson.loads(body))
+    except orjson.JSONDecodeError:
+        return hashlib.sha256(body).hexdigest()
+
+
+async def idempotency_key(
+    request: Request,
+    idempotency_key: Optional[str] = Header(
+        None,
+        max_length=255,
+        description="Retries with the same key get the first response back",
+    ),
+    token: str = Depends(oauth2_scheme),
+):
+    """
+    FastAPI dependency - claims the Idempotency-Key for the user in the JWT
+    Declare it before get_current_user/get_db so waiting costs no connection
+    """
+    try:
+        scope = decode_access_token(token).get("sub") if idempotency_key else None
+    except JWTError:
+        scope = None  # get_current_user rejects the request
+    if not scope:
+        yield Idempotency()
+        return
+
+    idempotency = Idempotency(
+        get_idempotency_store(),
+        scope,
+        idempotency_key,
+        await request_fingerprint(request),
+    )
+    try:
+        await idempotency.acquire()
+    except IdempotencyConflict:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request body",
+        )
+    except RedisError as e:
+        logger.warning(f"Idempotency store unavailable, running request: {e}")
+        yield Idempotency()
+        return
+
+    try:
+        yield idempotency
+    finally:
+        await run_in_threadpool(idempotency.release)
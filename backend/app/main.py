@@ -6,10 +6,19 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from app.database import init_db
-from app.routers import auth, tasks
-from app.middleware import RequestLoggingMiddleware
+from app.database import DB_CREATE_SCHEMA, engine, init_db, pool_wait, warm_pool
+from app.routers import admin, auth, tasks
+from app.middleware import (
+    CompressionMiddleware,
+    LoadSheddingMiddleware,
+    ProfilingMiddleware,
+    RequestLoggingMiddleware,
+)
 from app.logging_config import get_logger
+from app.readiness import readiness
+from app.redis_client import pool_stats as redis_pool_stats
+from app.serialization import FastJSONResponse
+from app.startup import StartupTimer, warm_up_validators
 
 logger = get_logger(__name__)
 
@@ -17,12 +26,33 @@ logger = get_logger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
-    Startup event - create database tables
+    Startup - optional schema DDL, warm DB pool and validators, then ready
     """
     logger.info("🚀 Application startup initiated")
-    init_db()
-    logger.info("✅ Database initialized successfully")
+    app.state.ready = False
+    timer = StartupTimer()
+
+    # Under gunicorn the master already did it (gunicorn.conf.py when_ready)
+    if DB_CREATE_SCHEMA and not getattr(app.state, "schema_ready", False):
+        with timer.phase("schema"):
+            init_db()
+        logger.info("✅ Database initialized successfully")
+
+    with timer.phase("db_pool"):
+        try:
+            warm_pool()
+        except Exception as e:
+            # Not fatal: the pool reconnects on demand once the DB is back
+            logger.warning(f"Database pool warm-up failed: {e}")
+
+    with timer.phase("validators"):
+        warm_up_validators()
+
+    app.state.startup = timer.report()
+    app.state.ready = True
+    readiness.start()
     yield
+    readiness.stop()
     logger.info("👋 Application shutdown")
 
 
@@ -32,11 +62,21 @@ app = FastAPI(
     description="RESTful API for task management with JWT authentication",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Per-request profiling (X-Profile header, admins only) - innermost
+app.add_middleware(ProfilingMiddleware)
+
+# Compress JSON bodies (Accept-Encoding), timed as part of the request
+app.add_middleware(CompressionMiddleware)
+
 # Add request logging middleware
 app.add_middleware(RequestLoggingMiddleware)
 
+# Shed load before logging and routing (later middleware wraps earlier)
+app.add_middleware(LoadSheddingMiddleware)
+
 # CORS - allow frontend to connect
 app.add_middleware(
     CORSMiddleware,
@@ -53,6 +93,7 @@ app.add_middleware(
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(tasks.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
 
 
 @app.get("/")
@@ -65,3 +106,33 @@ def root():
 def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+def ready_check():
+    """
+    Readiness - startup finished and dependencies within thresholds
+    Served from the background probe's last snapshot (app/readiness.py)
+    """
+    if not getattr(app.state, "ready", False):
+        return FastJSONResponse(
+            {"ready": False, "reasons": ["starting"]}, status_code=503
+        )
+    snapshot = readiness.snapshot()
+    return FastJSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+
+@app.get("/metrics")
+def metrics():
+    """
+    Connection pool usage for this worker process (not proxied by nginx)
+    """
+    return {
+        "db_pool": {
+            "size": engine.pool.size(),
+            "checked_out": engine.pool.checkedout(),
+            "overflow": engine.pool.overflow(),
+            "avg_wait_ms": round(pool_wait.average_ms(), 2),
+        },
+        "redis_pool": redis_pool_stats(),
+    }
@@ -1,13 +1,23 @@
 """
-Request logging middleware
+Request logging, load shedding, compression and per-request profiling middleware
 Logs all HTTP requests with timing and context
 """
 
+import os
 import time
 import uuid
 from fastapi import Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from jose import JWTError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from app import compression
+from app.auth import decode_active_token, is_admin
+from app.database import pool_wait
 from app.logging_config import get_logger
+from app.profiler import ProfilerBusy, Sampler
+from app.query_stats import check_request, start_request
 
 logger = get_logger(__name__)
 
@@ -15,13 +25,14 @@ logger = get_logger(__name__)
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """
     Middleware to log all HTTP requests with structured data
-    Adds request ID for tracing
+    Adds request ID for tracing, SQL query count and time (Server-Timing)
     """
 
     async def dispatch(self, request: Request, call_next):
         # Generate request ID for tracing
         request_id = str(uuid.uuid4())
         request.state.request_id = request_id
+        query_stats = start_request(request_id)
 
         # Start timer
         start_time = time.time()
@@ -53,11 +64,17 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                     "endpoint": request.url.path,
                     "status_code": response.status_code,
                     "duration_ms": round(duration_ms, 2),
+                    "db_queries": query_stats.count,
+                    "db_time_ms": round(query_stats.duration_ms, 2),
                 },
             )
+            check_request(query_stats, request.url.path)
 
-            # Add request ID to response headers
+            # Add request ID and DB timing to response headers
             response.headers["X-Request-ID"] = request_id
+            response.headers["Server-Timing"] = (
+                f"{query_stats.server_timing()}, app;dur={duration_ms:.2f}"
+            )
 
             return response
 
@@ -79,3 +96,208 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             )
 
             raise
+
+
+class LoadSheddingMiddleware:
+    """
+    Reject work early with 503 + Retry-After when this process is saturated:
+    too many requests in flight, or DB pool checkouts waiting too long.
+    Cheaper for everyone than queueing requests that will time out anyway.
+
+    Pure ASGI (not BaseHTTPMiddleware) so the check adds no per-request task.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_in_flight: int = None,
+        max_pool_wait_ms: float = None,
+        retry_after: int = None,
+        exempt_paths: tuple = ("/health", "/ready", "/metrics"),
+    ):
+        self.app = app
+        self.max_in_flight = max_in_flight or int(
+            os.getenv("SHED_MAX_IN_FLIGHT", "200")
+        )
+        self.max_pool_wait_ms = max_pool_wait_ms or float(
+            os.getenv("SHED_MAX_POOL_WAIT_MS", "1000")
+        )
+        self.retry_after = retry_after or int(os.getenv("SHED_RETRY_AFTER", "1"))
+        self.exempt_paths = exempt_paths
+        self.in_flight = 0
+
+    def overloaded(self) -> str:
+        """Reason this process should shed load, or '' if it is healthy"""
+        if self.in_flight >= self.max_in_flight:
+            return "in_flight"
+        if pool_wait.average_ms() >= self.max_pool_wait_ms:
+            return "pool_wait"
+        return ""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        reason = self.overloaded()
+        if reason:
+            logger.warning(
+                f"Load shed: {scope['method']} {scope['path']}",
+                extra={
+                    "endpoint": scope["path"],
+                    "reason": reason,
+                    "in_flight": self.in_flight,
+                    "pool_wait_ms": round(pool_wait.average_ms(), 2),
+                },
+            )
+            response = JSONResponse(
+                {"detail": "Service overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+
+class ProfilingMiddleware:
+    """
+    Profile a single request: an admin sends `X-Profile: 1` and gets the
+    collapsed stacks sampled while the request ran instead of its body
+    (original status in X-Profiled-Status). Requests without the header
+    only pay for one header lookup.
+    """
+
+    header = b"x-profile"
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def requested_by_admin(headers: dict) -> bool:
+        scheme, _, token = headers.get(b"authorization", b"").decode().partition(" ")
+        if scheme.lower() != "bearer":
+            return False
+        try:
+            # A logged-out admin token must not keep unlocking profiles
+            return is_admin(decode_active_token(token).get("sub"))
+        except JWTError:
+            return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if headers.get(self.header) not in (b"1", b"true"):
+            await self.app(scope, receive, send)
+            return
+        # The revocation check may go to Redis: keep it off the event loop
+        if not await run_in_threadpool(self.requested_by_admin, headers):
+            await self.app(scope, receive, send)  # ignore the header silently
+            return
+
+        try:
+            sampler = Sampler().start()
+        except ProfilerBusy as e:
+            await JSONResponse({"detail": str(e)}, status_code=409)(
+                scope, receive, send
+            )
+            return
+
+        status_code = 500
+
+        async def capture(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            sampler.stop()
+
+        response = PlainTextResponse(
+            sampler.collapsed(),
+            headers={
+                "X-Profiled-Status": str(status_code),
+                "X-Profile-Samples": str(sampler.samples),
+            },
+        )
+        await response(scope, receive, send)
+
+
+class CompressionMiddleware:
+    """
+    Content-negotiated response compression (zstd / br / gzip)
+
+    Only complete bodies are compressed: a response whose first body message
+    says more_body (StreamingResponse, file downloads) is passed through
+    untouched, so streaming keeps its latency. Large bodies are compressed
+    in the threadpool to keep the event loop free.
+    """
+
+    def __init__(self, app, min_size: int = None):
+        self.app = app
+        self.min_size = (
+            compression.COMPRESSION_MIN_SIZE if min_size is None else min_size
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = compression.choose_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not compression.is_compressible(
+                    headers.get("content-type", "")
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message  # hold until the body is known
+                return
+
+            # First body message
+            passthrough = True
+            body = message.get("body", b"")
+            if message.get("more_body") or len(body) < self.min_size:
+                await send(start_message)
+                await send(message)
+                return
+
+            encode = compression.ENCODERS[encoding]
+            if len(body) >= compression.COMPRESSION_THREADPOOL_SIZE:
+                body = await run_in_threadpool(encode, body)
+            else:
+                body = encode(body)
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
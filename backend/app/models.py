@@ -2,13 +2,25 @@
 SQLAlchemy models - Database tables
 """
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Enum,
+    Integer,
+    Index,
+    DDL,
+    event,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
 import enum
-from app.database import Base
+from app.database import Base, TASKS_PARTITIONS
 
 
 class PriorityEnum(str, enum.Enum):
@@ -48,8 +60,12 @@ class Task(Base):
     __tablename__ = "tasks"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Partitioned tables need the partition key in the primary key
     user_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        primary_key=TASKS_PARTITIONS > 0,
     )
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
@@ -62,3 +78,90 @@ class Task(Base):
 
     # Task belongs to one user
     owner = relationship("User", back_populates="tasks")
+
+    # Every list query is "WHERE user_id = ? ORDER BY created_at DESC";
+    # the partial index lets the archival job find old completed tasks
+    __table_args__ = (
+        Index("ix_tasks_user_id_created_at", user_id, created_at.desc()),
+        Index(
+            "ix_tasks_completed_updated_at",
+            updated_at,
+            postgresql_where=status == StatusEnum.completed,
+        ),
+        {"postgresql_partition_by": "HASH (user_id)"} if TASKS_PARTITIONS else {},
+    )
+
+
+def tasks_partitions_ddl(partitions: int, parent: str = "tasks") -> list:
+    """CREATE TABLE statements for the hash partitions of `parent`"""
+    return [
+        f"CREATE TABLE IF NOT EXISTS tasks_p{i} PARTITION OF {parent} "
+        f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {i})"
+        for i in range(partitions)
+    ]
+
+
+if TASKS_PARTITIONS:
+    for statement in tasks_partitions_ddl(TASKS_PARTITIONS):
+        event.listen(Task.__table__, "after_create", DDL(statement))
+
+
+class TaskCounter(Base):
+    """
+    Per-user task counts by status and priority
+    Maintained in the same transaction as task writes (see app/stats.py)
+    """
+
+    __tablename__ = "task_counters"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    status = Column(Enum(StatusEnum), primary_key=True)
+    priority = Column(Enum(PriorityEnum), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ArchivedTask(Base):
+    """
+    Completed tasks moved out of the hot tasks table (see app/archive.py)
+    Same columns as Task, plus when the row was archived
+    """
+
+    __tablename__ = "tasks_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    priority = Column(Enum(PriorityEnum), nullable=False)
+    status = Column(Enum(StatusEnum), nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_tasks_archive_user_id_created_at", user_id, created_at.desc()),
+    )
+
+
+class DigestRun(Base):
+    """
+    One scheduled digest run over all users (see app/digest.py)
+    last_user_id is the checkpoint: an interrupted run resumes after it
+    """
+
+    __tablename__ = "digest_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    window_start = Column(DateTime(timezone=True), nullable=False)
+    window_end = Column(DateTime(timezone=True), nullable=False, index=True)
+    last_user_id = Column(UUID(as_uuid=True), nullable=True)
+    users_processed = Column(Integer, nullable=False, default=0)
+    digests_sent = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,170 @@
+"""
+Online migration of the tasks table to hash partitions on user_id
+
+    python -m app.partitioning migrate --partitions 16
+
+1. Create tasks_partitioned (PARTITION BY HASH (user_id)) and its partitions
+2. Install a trigger on tasks mirroring every write into the new table
+3. Backfill existing rows in keyset batches, one short transaction each
+   (rows are read FOR SHARE so concurrent updates/deletes wait for the
+   batch and are then mirrored by the trigger)
+4. Swap the tables in one brief ACCESS EXCLUSIVE transaction
+
+Rerunning after an interruption skips straight to the (idempotent) backfill.
+The old table is kept as tasks_unpartitioned for rollback; drop it once
+satisfied. Afterwards run the app with TASKS_PARTITIONS set to the same N.
+"""
+
+import argparse
+import time
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.database import engine
+from app.logging_config import get_logger
+from app.models import tasks_partitions_ddl
+
+logger = get_logger(__name__)
+
+MIRROR_FUNCTION = """
+CREATE OR REPLACE FUNCTION tasks_mirror_to_partitioned() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM tasks_partitioned WHERE id = OLD.id AND user_id = OLD.user_id;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    INSERT INTO tasks_partitioned SELECT (NEW).* ON CONFLICT DO NOTHING;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+BACKFILL_BATCH = """
+WITH batch AS (
+    SELECT * FROM tasks WHERE id > :after ORDER BY id LIMIT :batch_size FOR SHARE
+), copied AS (
+    INSERT INTO tasks_partitioned SELECT * FROM batch ON CONFLICT DO NOTHING
+)
+SELECT (SELECT count(*) FROM batch), (SELECT id FROM batch ORDER BY id DESC LIMIT 1)
+"""
+
+
+def is_partitioned(conn) -> bool:
+    return bool(
+        conn.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'tasks'::regclass"
+            )
+        ).scalar()
+    )
+
+
+def prepare(db_engine: Engine, partitions: int) -> None:
+    """Steps 1-2: partitioned copy of the schema plus the mirroring trigger"""
+    with db_engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS tasks_partitioned "
+                "(LIKE tasks INCLUDING DEFAULTS) PARTITION BY HASH (user_id)"
+            )
+        )
+        conn.execute(
+            text(
+                "ALTER TABLE tasks_partitioned "
+                "ADD CONSTRAINT tasks_partitioned_pkey PRIMARY KEY (id, user_id), "
+                "ADD CONSTRAINT tasks_partitioned_user_id_fkey FOREIGN KEY (user_id) "
+                "REFERENCES users (id) ON DELETE CASCADE"
+            )
+        )
+        for statement in tasks_partitions_ddl(partitions, parent="tasks_partitioned"):
+            conn.execute(text(statement))
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_tasks_partitioned_user_id_created_at "
+                "ON tasks_partitioned (user_id, created_at DESC)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_tasks_partitioned_completed_updated_at "
+                "ON tasks_partitioned (updated_at) WHERE status = 'completed'"
+            )
+        )
+        conn.execute(text(MIRROR_FUNCTION))
+        conn.execute(
+            text(
+                "CREATE TRIGGER tasks_mirror AFTER INSERT OR UPDATE OR DELETE ON tasks "
+                "FOR EACH ROW EXECUTE FUNCTION tasks_mirror_to_partitioned()"
+            )
+        )
+    logger.info(f"Created tasks_partitioned with {partitions} partitions")
+
+
+def backfill(db_engine: Engine, batch_size: int = 10000, pause: float = 0.0) -> int:
+    """Step 3: copy existing rows, one committed batch at a time"""
+    after = "00000000-0000-0000-0000-000000000000"
+    copied = 0
+    while True:
+        with db_engine.begin() as conn:
+            count, last_id = conn.execute(
+                text(BACKFILL_BATCH), {"after": after, "batch_size": batch_size}
+            ).one()
+        if not count:
+            break
+
+        copied += count
+        after = last_id
+        logger.info(f"Backfilled {copied} tasks", extra={"copied": copied})
+        if pause:
+            time.sleep(pause)  # let vacuum and replicas keep up
+    return copied
+
+
+def swap(db_engine: Engine) -> None:
+    """Step 4: make the partitioned table the live one"""
+    with db_engine.begin() as conn:
+        conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        conn.execute(text("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE"))
+        conn.execute(text("DROP TRIGGER tasks_mirror ON tasks"))
+        conn.execute(text("ALTER TABLE tasks RENAME TO tasks_unpartitioned"))
+        conn.execute(text("ALTER TABLE tasks_partitioned RENAME TO tasks"))
+        conn.execute(text("DROP FUNCTION tasks_mirror_to_partitioned()"))
+    logger.info("tasks is now hash-partitioned; old table kept as tasks_unpartitioned")
+
+
+def migrate(partitions: int, batch_size: int, pause: float) -> None:
+    """Run all steps; an interrupted run resumes at the backfill"""
+    with engine.connect() as conn:
+        if is_partitioned(conn):
+            logger.info("tasks is already partitioned, nothing to do")
+            return
+        prepared = conn.execute(
+            text("SELECT to_regclass('tasks_partitioned')")
+        ).scalar()
+
+    if not prepared:
+        prepare(engine, partitions)
+    copied = backfill(engine, batch_size, pause)
+    swap(engine)
+    logger.info(f"Partitioning migration finished ({copied} tasks copied)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hash-partition the tasks table")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    migrate_cmd = subcommands.add_parser("migrate", help="Online migration")
+    migrate_cmd.add_argument("--partitions", type=int, default=16)
+    migrate_cmd.add_argument("--batch-size", type=int, default=10000)
+    migrate_cmd.add_argument(
+        "--pause", type=float, default=0.0, help="Seconds to sleep between batches"
+    )
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        migrate(args.partitions, args.batch_size, args.pause)
+
+
+if __name__ == "__main__":
+    main()
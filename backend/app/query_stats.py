@@ -0,0 +1,140 @@
+"""
+Per-request SQL instrumentation - query counts, DB time and N+1 detection
+
+SQLAlchemy engine events time every statement and add it to the QueryStats
+of the current request (a context variable set by RequestLoggingMiddleware).
+Statements outside a request (workers, startup) are not collected.
+"""
+
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Same statement more than this many times in one request looks like N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+# Statements slower than this are logged individually
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Raise instead of warn when a route exceeds its QueryBudget (tests, CI)
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "false").lower() == "true"
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A route ran more queries than its declared budget (strict mode)"""
+
+
+class QueryStats:
+    """Queries run while serving one request"""
+
+    def __init__(self, request_id: str = None):
+        self.request_id = request_id
+        self.count = 0
+        self.duration_ms = 0.0
+        self.statements: Counter = Counter()
+        self.budget: Optional[int] = None
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = None) -> List[Tuple[str, int]]:
+        """Statements executed more than `threshold` times (N+1 suspects)"""
+        threshold = N_PLUS_ONE_THRESHOLD if threshold is None else threshold
+        return [(sql, n) for sql, n in self.statements.items() if n > threshold]
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (shows up in browser dev tools)"""
+        return f'db;dur={self.duration_ms:.2f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request(request_id: str = None) -> QueryStats:
+    """Begin collecting for the current request"""
+    stats = QueryStats(request_id)
+    _current.set(stats)
+    return stats
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def check_request(stats: QueryStats, endpoint: str) -> None:
+    """Warn about N+1 patterns and budget overruns once the request is done"""
+    for statement, times in stats.repeated():
+        logger.warning(
+            f"Possible N+1 query: statement ran {times} times",
+            extra={
+                "request_id": stats.request_id,
+                "endpoint": endpoint,
+                "statement": statement[:500],
+                "times": times,
+            },
+        )
+
+    if stats.budget is not None and stats.count > stats.budget:
+        message = (
+            f"{endpoint} ran {stats.count} queries (budget {stats.budget}): "
+            + "; ".join(sql[:120] for sql in stats.statements)
+        )
+        if QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(
+            "Query budget exceeded",
+            extra={
+                "request_id": stats.request_id,
+                "endpoint": endpoint,
+                "db_queries": stats.count,
+                "query_budget": stats.budget,
+            },
+        )
+
+
+class QueryBudget:
+    """
+    FastAPI dependency - declare how many queries a route may run
+    Usage: @router.get("", dependencies=[Depends(QueryBudget(2))])
+    """
+
+    def __init__(self, max_queries: int):
+        self.max_queries = max_queries
+
+    def __call__(self):
+        stats = _current.get()
+        if stats is not None:
+            stats.budget = self.max_queries
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None or not conn.info.get("query_start"):
+        return
+
+    duration_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    stats.record(statement, duration_ms)
+    if duration_ms >= SLOW_QUERY_MS:
+        logger.warning(
+            f"Slow query: {duration_ms:.1f} ms",
+            extra={
+                "request_id": stats.request_id,
+                "statement": statement[:500],
+                "duration_ms": round(duration_ms, 2),
+            },
+        )
@@ -1,20 +1,38 @@
 """
 Redis Queue setup
+
+The queue is created on first use, not at import: booting the API neither
+waits for nor depends on Redis, and rq is only imported when enqueuing.
+Enqueuing uses the shared client from app.redis_client, so it times out
+(or fails fast while the circuit is open) instead of hanging a request.
 """
 
 import os
-from redis import Redis
-from rq import Queue
 from app.logging_config import get_logger
+from app.redis_client import get_redis
 
 logger = get_logger(__name__)
 
-# Connect to Redis
-redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
-redis_conn = Redis.from_url(redis_url)
+# immediate: one notification job per task action; digest: only the
+# scheduled per-user digest (app/digest.py); both: the two combined
+NOTIFICATION_MODE = os.getenv("NOTIFICATION_MODE", "immediate").lower()
+
+_task_queue = None
+
+
+def get_task_queue():
+    """The RQ "tasks" queue"""
+    global _task_queue
+    if _task_queue is None:
+        from rq import Queue
+
+        _task_queue = Queue("tasks", connection=get_redis())
+    return _task_queue
+
 
-# Create queue
-task_queue = Queue("tasks", connection=redis_conn)
+def queue_backlog() -> int:
+    """Jobs waiting in the "tasks" queue (RQ's list, read without importing rq)"""
+    return get_redis().llen("rq:queue:tasks")
 
 
 def enqueue_notification(task_id: str, task_title: str, user_email: str, action: str):
@@ -23,6 +41,9 @@ def enqueue_notification(task_id: str, task_title: str, user_email: str, action:
     """
     from app.workers.tasks import send_task_notification
 
+    if NOTIFICATION_MODE == "digest":
+        return None  # covered by the next digest
+
     logger.info(
         f"Enqueuing notification job: {action}",
         extra={
@@ -36,6 +57,7 @@ def enqueue_notification(task_id: str, task_title: str, user_email: str, action:
         },
     )
 
+    task_queue = get_task_queue()
     job = task_queue.enqueue(
         send_task_notification,
         task_id=task_id,
@@ -59,3 +81,105 @@ def enqueue_notification(task_id: str, task_title: str, user_email: str, action:
     )
 
     return job.id
+
+
+def schedule_digest(run_at=None):
+    """
+    Enqueue the digest job for `run_at` (default: the next slot)
+    Needs a worker started with --with-scheduler; the job schedules its
+    successor when it ends, so this is only called once to bootstrap.
+    """
+    from rq import Retry
+    from app.digest import next_run_at
+    from app.workers.tasks import send_digests_job
+
+    run_at = run_at or next_run_at()
+    get_task_queue().enqueue_at(
+        run_at,
+        send_digests_job,
+        job_id=f"digest-{run_at:%Y%m%dT%H%M}",  # one job per slot
+        job_timeout="2h",
+        retry=Retry(max=3, interval=[60, 300, 900]),
+    )
+    logger.info(
+        "Digest job scheduled",
+        extra={
+            "queue_name": "tasks",
+            "job_type": "send_digests",
+            "run_at": str(run_at),
+        },
+    )
+    return run_at
+
+
+def schedule_archive(run_at=None):
+    """
+    Enqueue the archival job for `run_at` (default: next ARCHIVE_HOUR_UTC)
+    Like the digest, each run schedules the next; call this once to bootstrap.
+    """
+    from rq import Retry
+    from app.archive import next_run_at
+    from app.workers.tasks import archive_completed_tasks_job
+
+    run_at = run_at or next_run_at()
+    get_task_queue().enqueue_at(
+        run_at,
+        archive_completed_tasks_job,
+        job_id=f"archive-{run_at:%Y%m%dT%H%M}",  # one job per night
+        job_timeout="2h",
+        retry=Retry(max=3, interval=[60, 300, 900]),
+    )
+    logger.info(
+        "Archival job scheduled",
+        extra={
+            "queue_name": "tasks",
+            "job_type": "archive_completed_tasks",
+            "run_at": str(run_at),
+        },
+    )
+    return run_at
+
+
+def schedule_reconcile(run_at=None):
+    """
+    Enqueue the counter reconciliation for `run_at` (default: next
+    RECONCILE_HOUR_UTC); each run schedules the next
+    """
+    from rq import Retry
+    from app.stats import next_run_at
+    from app.workers.tasks import reconcile_task_stats_job
+
+    run_at = run_at or next_run_at()
+    get_task_queue().enqueue_at(
+        run_at,
+        reconcile_task_stats_job,
+        job_id=f"reconcile-{run_at:%Y%m%dT%H%M}",  # one job per night
+        job_timeout="2h",
+        retry=Retry(max=3, interval=[60, 300, 900]),
+    )
+    logger.info(
+        "Stats reconciliation job scheduled",
+        extra={
+            "queue_name": "tasks",
+            "job_type": "reconcile_task_stats",
+            "run_at": str(run_at),
+        },
+    )
+    return run_at
+
+
+def schedule_periodic_jobs() -> None:
+    """
+    Bootstrap the self-rescheduling jobs (gunicorn.conf.py when_ready)
+    Job ids are per slot, so every deploy re-scheduling them is harmless.
+    Redis being down must not stop the API from starting: each run also
+    schedules its successor, and the CLIs can bootstrap them later.
+    """
+    schedulers = [schedule_archive, schedule_reconcile]
+    if NOTIFICATION_MODE in ("digest", "both"):
+        schedulers.append(schedule_digest)
+    for schedule in schedulers:
+        try:
+            schedule()
+        except Exception as e:
+            logger.warning(f"Could not schedule {schedule.__name__}: {e}")
@@ -0,0 +1,179 @@
+"""
+Distributed rate limiting - Redis token buckets keyed by user or client IP
+"""
+
+import ipaddress
+import math
+import os
+from typing import Optional, Tuple
+from fastapi import HTTPException, Request, status
+from jose import JWTError
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.auth import decode_access_token
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+
+# Peers allowed to set X-Real-IP (comma-separated addresses or CIDRs): the
+# reverse proxy. From anyone else the header is ignored - a client talking
+# to the app directly could otherwise send a fresh IP (and bucket) each time.
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(proxy.strip(), strict=False)
+    for proxy in os.getenv("TRUSTED_PROXIES", "127.0.0.1,::1").split(",")
+    if proxy.strip()
+]
+
+# Refill and take in one atomic step. Uses the Redis clock so every API
+# replica sees the same time. Floats are returned as strings (Lua -> Redis
+# integer conversion would truncate them).
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class TokenBucketLimiter:
+    """Token bucket limiter evaluated atomically in Redis"""
+
+    def __init__(self, redis_conn: Redis, prefix: str = "ratelimit"):
+        self.redis = redis_conn
+        self.prefix = prefix
+        self._script = redis_conn.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def hit(
+        self, key: str, rate: float, burst: int, cost: int = 1
+    ) -> Tuple[bool, float]:
+        """
+        Take `cost` tokens from bucket `key`
+        Returns (allowed, seconds until enough tokens are available)
+        """
+        allowed, retry_after = self._script(
+            keys=[f"{self.prefix}:{key}"], args=[rate, burst, cost]
+        )
+        return bool(allowed), float(retry_after)
+
+
+limiter: Optional[TokenBucketLimiter] = None
+
+
+def get_limiter() -> TokenBucketLimiter:
+    """Shared limiter (created on first use)"""
+    global limiter
+    if limiter is None:
+        from app.redis_client import get_redis
+
+        limiter = TokenBucketLimiter(get_redis())
+    return limiter
+
+
+def parse_limit(spec: str) -> Tuple[float, int]:
+    """'30/10' (30 requests per 10 seconds) -> (refill rate per second, burst)"""
+    requests, seconds = spec.split("/")
+    burst = int(requests)
+    return burst / float(seconds), burst
+
+
+def is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(request: Request) -> str:
+    """
+    Client address - the socket peer, or X-Real-IP when the peer is one of
+    TRUSTED_PROXIES (the nginx reverse proxy sets it)
+    """
+    peer = request.client.host if request.client else None
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip and peer and is_trusted_proxy(peer):
+        return real_ip.strip()
+    return peer or "unknown"
+
+
+def request_identity(request: Request) -> str:
+    """Rate limit key: authenticated user if a valid bearer token is sent, else IP"""
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = decode_access_token(token).get("sub")
+            if subject:
+                return f"user:{subject}"
+        except JWTError:
+            pass
+    return f"ip:{client_ip(request)}"
+
+
+class RateLimit:
+    """
+    FastAPI dependency - per-route token bucket
+    Usage: @router.get("/search", dependencies=[Depends(RateLimit("search", "30/10"))])
+
+    The limit can be overridden per scope with RATE_LIMIT_<SCOPE>=<requests>/<seconds>.
+    Redis errors fail open: a Redis outage must not take the API down with it.
+    """
+
+    def __init__(self, scope: str, default: str):
+        self.scope = scope
+        self.rate, self.burst = parse_limit(
+            os.getenv(f"RATE_LIMIT_{scope.upper()}", default)
+        )
+
+    def __call__(self, request: Request):
+        if not RATE_LIMIT_ENABLED:
+            return
+
+        identity = request_identity(request)
+        try:
+            allowed, retry_after = get_limiter().hit(
+                f"{self.scope}:{identity}", self.rate, self.burst
+            )
+        except RedisError as e:
+            logger.warning(
+                f"Rate limiter unavailable, allowing request: {e}",
+                extra={"scope": self.scope},
+            )
+            return
+
+        if not allowed:
+            logger.warning(
+                f"Rate limit exceeded: {self.scope}",
+                extra={
+                    "scope": self.scope,
+                    "identity": identity,
+                    "retry_after": round(retry_after, 2),
+                },
+            )
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
@@ -0,0 +1,165 @@
+"""
+Readiness - cached dependency probes behind GET /ready
+
+A background thread per process measures DB pool saturation and SELECT 1
+latency, Redis PING latency and the notification queue backlog every
+READINESS_INTERVAL seconds. /ready only reads the last snapshot, so
+orchestrator probes cost nothing and cannot pile load onto a struggling
+database. A threshold of 0 disables that check.
+
+Only the database gates readiness by default. Requests degrade gracefully
+without Redis (fail open), and the queue backlog is cluster-wide, so pulling
+every instance out of rotation would only turn a slow worker into an outage:
+Redis errors are reported as warnings unless READY_REDIS_REQUIRED=true, and
+the Redis latency and backlog thresholds are off unless set.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+from sqlalchemy import text
+
+from app.database import engine, pool_wait
+from app.logging_config import get_logger
+from app.redis_client import get_redis
+
+logger = get_logger(__name__)
+
+READINESS_INTERVAL = float(os.getenv("READINESS_INTERVAL", "5"))
+# Not ready above any of these
+READY_MAX_DB_POOL_UTILIZATION = float(os.getenv("READY_MAX_DB_POOL_UTILIZATION", "0.9"))
+READY_MAX_DB_LATENCY_MS = float(os.getenv("READY_MAX_DB_LATENCY_MS", "500"))
+READY_MAX_REDIS_LATENCY_MS = float(os.getenv("READY_MAX_REDIS_LATENCY_MS", "0"))
+READY_MAX_QUEUE_BACKLOG = int(os.getenv("READY_MAX_QUEUE_BACKLOG", "0"))
+# Not ready when Redis (and so the queue) cannot be reached
+READY_REDIS_REQUIRED = os.getenv("READY_REDIS_REQUIRED", "false").lower() == "true"
+
+
+def _ms_since(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+class ReadinessProbe:
+    """Refreshes a snapshot of dependency health; /ready reads snapshot()"""
+
+    def __init__(self, interval: float = None, redis_conn=None):
+        self.interval = interval or READINESS_INTERVAL
+        self.redis = redis_conn
+        self.max_db_pool_utilization = READY_MAX_DB_POOL_UTILIZATION
+        self.max_db_latency_ms = READY_MAX_DB_LATENCY_MS
+        self.max_redis_latency_ms = READY_MAX_REDIS_LATENCY_MS
+        self.max_queue_backlog = READY_MAX_QUEUE_BACKLOG
+        self.redis_required = READY_REDIS_REQUIRED
+        self._snapshot: Optional[dict] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check_db(self) -> dict:
+        pool = engine.pool
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        result = {
+            "checked_out": pool.checkedout(),
+            "pool_utilization": round(pool.checkedout() / capacity, 2),
+            "avg_pool_wait_ms": round(pool_wait.average_ms(), 2),
+        }
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        result["latency_ms"] = _ms_since(start)
+        return result
+
+    def check_redis(self) -> dict:
+        start = time.perf_counter()
+        (self.redis or get_redis()).ping()
+        return {"latency_ms": _ms_since(start)}
+
+    def check_queue(self) -> dict:
+        from app.queue import queue_backlog
+
+        return {"backlog": queue_backlog()}
+
+    def problems(self, checks: dict) -> tuple:
+        """
+        (reasons the snapshot is not ready, failures that are only reported)
+        Both are empty when everything is healthy
+        """
+        limits = [
+            ("db", "pool_utilization", self.max_db_pool_utilization),
+            ("db", "latency_ms", self.max_db_latency_ms),
+            ("redis", "latency_ms", self.max_redis_latency_ms),
+            ("queue", "backlog", self.max_queue_backlog),
+        ]
+        reasons, warnings = [], []
+        for name in checks:
+            if "error" in checks[name]:
+                required = name == "db" or self.redis_required
+                problem = f"{name}: {checks[name]['error']}"
+                (reasons if required else warnings).append(problem)
+        for name, field, limit in limits:
+            value = checks[name].get(field)
+            if limit and value is not None and value > limit:
+                reasons.append(f"{name}: {field} {value} > {limit}")
+        return reasons, warnings
+
+    def refresh(self) -> dict:
+        checks = {}
+        for name, check in (
+            ("db", self.check_db),
+            ("redis", self.check_redis),
+            ("queue", self.check_queue),
+        ):
+            try:
+                checks[name] = check()
+            except Exception as e:
+                checks[name] = {"error": f"{type(e).__name__}: {e}"}
+        reasons, warnings = self.problems(checks)
+        was_ready = self._snapshot is None or self._snapshot["ready"]
+        if was_ready and reasons:
+            logger.warning(f"Not ready: {'; '.join(reasons)}")
+        elif not was_ready and not reasons:
+            logger.info("Ready again")
+        had_warnings = self._snapshot is not None and self._snapshot["warnings"]
+        if warnings and not had_warnings:
+            logger.warning(f"Degraded (still ready): {'; '.join(warnings)}")
+        self._snapshot = {
+            "ready": not reasons,
+            "reasons": reasons,
+            "warnings": warnings,
+            "checked_at": time.time(),
+            "checks": checks,
+        }
+        return self._snapshot
+
+    def snapshot(self) -> dict:
+        """Last snapshot; not ready if there is none or it has gone stale"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"ready": False, "reasons": ["not checked yet"], "checks": {}}
+        age = time.time() - snapshot["checked_at"]
+        if age > 3 * self.interval:
+            # The probe thread itself is stuck (e.g. blocked on the pool)
+            return {
+                **snapshot,
+                "ready": False,
+                "reasons": snapshot["reasons"] + [f"stale: {age:.0f}s old"],
+            }
+        return snapshot
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="readiness-probe", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+
+readiness = ReadinessProbe()
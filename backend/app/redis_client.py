@@ -0,0 +1,178 @@
+"""
+Shared Redis client - bounded pool, timeouts and a circuit breaker
+
+Every Redis user in the API (RQ enqueue, rate limiter, single-flight, read
+fences, token revocation) goes through get_redis(). Commands time out
+instead of hanging a request thread, and after repeated connection failures
+the breaker fails them immediately (CircuitOpenError, a RedisError, so the
+existing fallbacks apply) until a trial command succeeds again.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+from redis import BlockingConnectionPool, Redis
+from redis.client import Pipeline
+from redis.exceptions import ConnectionError, TimeoutError
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+# Per process; requests wait up to REDIS_POOL_TIMEOUT for a free connection
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "0.5"))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "0.5"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1.0"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+# Consecutive failures that open the breaker, and seconds before a retry
+REDIS_BREAKER_THRESHOLD = int(os.getenv("REDIS_BREAKER_THRESHOLD", "5"))
+REDIS_BREAKER_RESET = float(os.getenv("REDIS_BREAKER_RESET", "10"))
+
+
+class CircuitOpenError(ConnectionError):
+    """Redis was failing recently; the command was not attempted"""
+
+
+class CircuitBreaker:
+    """
+    closed -> (threshold consecutive failures) -> open -> (reset_timeout)
+    -> half_open: one trial call; success closes, failure reopens
+    """
+
+    def __init__(self, failure_threshold: int = None, reset_timeout: float = None):
+        self.failure_threshold = failure_threshold or REDIS_BREAKER_THRESHOLD
+        self.reset_timeout = (
+            REDIS_BREAKER_RESET if reset_timeout is None else reset_timeout
+        )
+        self.state = "closed"
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._trial_in_flight:
+                    self.rejected += 1
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != "closed":
+                logger.info("Redis circuit closed")
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning(
+                        f"Redis circuit opened after {self.failures} failures",
+                        extra={"failures": self.failures},
+                    )
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def call(self, fn, *args, **kwargs):
+        if not self.allow():
+            raise CircuitOpenError("Redis circuit open, failing fast")
+        try:
+            result = fn(*args, **kwargs)
+        except (ConnectionError, TimeoutError):
+            self.record_failure()
+            raise
+        except Exception:
+            self.record_success()  # Redis answered, just not happily
+            raise
+        self.record_success()
+        return result
+
+
+class BreakerPipeline(Pipeline):
+    breaker: CircuitBreaker = None
+
+    def execute(self, raise_on_error=True):
+        return self.breaker.call(super().execute, raise_on_error)
+
+
+class BreakerRedis(Redis):
+    """Redis client whose commands and pipelines go through a CircuitBreaker"""
+
+    def __init__(self, *args, breaker: CircuitBreaker = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.breaker = breaker or CircuitBreaker()
+
+    def execute_command(self, *args, **options):
+        return self.breaker.call(super().execute_command, *args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None) -> Pipeline:
+        pipe = BreakerPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+        pipe.breaker = self.breaker
+        return pipe
+
+
+def create_redis(url: str = None, **overrides) -> BreakerRedis:
+    """New client with its own bounded pool (tests, tools, the shared client)"""
+    options = dict(
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+    )
+    breaker = overrides.pop("breaker", None)
+    options.update(overrides)
+    pool = BlockingConnectionPool.from_url(url or REDIS_URL, **options)
+    return BreakerRedis(connection_pool=pool, breaker=breaker)
+
+
+_redis: Optional[BreakerRedis] = None
+_lock = threading.Lock()
+
+
+def get_redis() -> BreakerRedis:
+    """Shared client for this process (created on first use, never connects early)"""
+    global _redis
+    if _redis is None:
+        with _lock:
+            if _redis is None:
+                _redis = create_redis()
+    return _redis
+
+
+def pool_stats(client: BreakerRedis = None) -> dict:
+    """Connection pool usage and breaker state, for /metrics"""
+    client = client or _redis
+    if client is None:
+        return {"initialized": False}
+    pool = client.connection_pool
+    created = len(pool._connections)
+    idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    return {
+        "initialized": True,
+        "max_connections": pool.max_connections,
+        "created": created,
+        "in_use": created - idle,
+        "idle": idle,
+        "breaker_state": client.breaker.state,
+        "breaker_failures": client.breaker.failures,
+        "breaker_rejected": client.breaker.rejected,
+    }
@@ -0,0 +1,185 @@
+"""
+Read-replica routing with read-your-writes consistency
+
+Read-only endpoints take their session from get_read_db. It hands out a
+session on a healthy streaming replica unless the user wrote recently and
+the replica has not yet replayed that write, in which case it falls back to
+the primary.
+
+The fence is the primary's WAL position (LSN) after the user's last commit,
+kept in Redis so every API process and replica sees it.
+Configure with REPLICA_DATABASE_URLS=url1,url2 (unset = primary only).
+"""
+
+import itertools
+import os
+import threading
+import time
+from typing import List, Optional
+from uuid import UUID
+from fastapi import Depends
+from redis.exceptions import RedisError
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.auth import get_current_user
+from app.database import get_db
+from app.logging_config import get_logger
+from app.models import User
+
+logger = get_logger(__name__)
+
+REPLICA_DATABASE_URLS = [
+    url.strip()
+    for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",")
+    if url.strip()
+]
+# Seconds between health checks of a replica
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))
+# How long after a write the user's fence is kept (must exceed worst lag)
+REPLICA_FENCE_TTL = int(os.getenv("REPLICA_FENCE_TTL", "60"))
+
+
+class Replica:
+    """One replica engine plus its cached health"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_engine(url, pool_pre_ping=True)
+        self.session_factory = sessionmaker(
+            autocommit=False, autoflush=False, bind=self.engine
+        )
+        self.healthy = True
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.url.split("@")[-1]
+
+    def is_healthy(self) -> bool:
+        """Ping at most once per REPLICA_HEALTH_INTERVAL, serve cached state"""
+        if time.monotonic() - self.checked_at < REPLICA_HEALTH_INTERVAL:
+            return self.healthy
+        if not self._lock.acquire(blocking=False):
+            return self.healthy  # another request is already checking
+
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            healthy = True
+        except SQLAlchemyError as e:
+            healthy = False
+            logger.warning(f"Replica {self.name} unhealthy: {e}")
+        finally:
+            self.checked_at = time.monotonic()
+            self._lock.release()
+
+        if healthy and not self.healthy:
+            logger.info(f"Replica {self.name} healthy again")
+        self.healthy = healthy
+        return healthy
+
+
+class ReplicaRouter:
+    """Round-robin over healthy replicas, honouring a per-user LSN fence"""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+
+    @staticmethod
+    def _caught_up(db: Session, fence_lsn: str) -> bool:
+        return db.execute(
+            text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"),
+            {"lsn": fence_lsn},
+        ).scalar()
+
+    def session(self, fence_lsn: Optional[str] = None) -> Optional[Session]:
+        """A replica session that has replayed up to `fence_lsn`, or None"""
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if not replica.is_healthy():
+                continue
+
+            db = replica.session_factory()
+            try:
+                if fence_lsn is None or self._caught_up(db, fence_lsn):
+                    return db
+            except SQLAlchemyError as e:
+                logger.warning(f"Replica {replica.name} query failed: {e}")
+                replica.healthy = False
+            db.close()
+        return None
+
+
+router = ReplicaRouter(REPLICA_DATABASE_URLS)
+
+
+def _fence_key(user_id: UUID) -> str:
+    return f"rw_fence:{user_id}"
+
+
+def record_write(db: Session, user_id: UUID) -> None:
+    """
+    Call after committing a user's write on the primary
+    Remembers the primary's WAL position so later reads wait for it
+    """
+    if not router.replicas:
+        return
+
+    from app.redis_client import get_redis
+
+    lsn = db.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+    try:
+        get_redis().set(_fence_key(user_id), lsn, ex=REPLICA_FENCE_TTL)
+    except RedisError as e:
+        logger.warning(f"Failed to record read-your-writes fence: {e}")
+
+
+def _read_fence(user_id: UUID) -> Optional[str]:
+    """The user's fence LSN; raises RedisError if it cannot be known"""
+    from app.redis_client import get_redis
+
+    lsn = get_redis().get(_fence_key(user_id))
+    return lsn.decode() if lsn else None
+
+
+def read_source(db: Session) -> str:
+    """
+    Where a get_read_db session reads from - "primary" or "replica", plus the
+    user's fence LSN. Part of single-flight keys, so a fenced read never
+    joins a flight that started earlier on a lagging replica.
+    """
+    return db.info.get("read_source", "primary")
+
+
+def get_read_db(
+    current_user: User = Depends(get_current_user), primary: Session = Depends(get_db)
+):
+    """
+    FastAPI dependency - session for read-only endpoints
+    Replica when one is healthy and caught up with this user, else the
+    request's primary session (the one get_current_user already holds)
+    """
+    fence = None
+    db = None
+    if router.replicas:
+        try:
+            fence = _read_fence(current_user.id)
+            db = router.session(fence)
+        except RedisError as e:
+            # Fence unknown - only the primary is guaranteed fresh enough
+            logger.warning(f"Read-your-writes fence unavailable: {e}")
+
+    if db is None:
+        primary.info["read_source"] = f"primary:{fence}"
+        yield primary  # closed by get_db
+        return
+
+    db.info["read_source"] = f"replica:{fence}"
+    try:
+        yield db
+    finally:
+        db.close()
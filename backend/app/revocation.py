@@ -0,0 +1,181 @@
+"""
+Access token revocation (logout) without a Redis round trip per request
+
+Revoked token ids (jti) live in Redis until the token would have expired
+anyway. Each process mirrors them into a Bloom filter kept current through
+pub/sub, so the common case - a token that was never revoked - is answered
+from memory. Only filter hits (revoked, or the rare false positive) are
+confirmed against Redis.
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+from typing import Optional
+from redis.exceptions import RedisError
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Expected revoked-and-unexpired tokens at once, and the false positive rate
+# at that size (100k / 0.1% -> ~176 KiB per process)
+REVOCATION_CAPACITY = int(os.getenv("REVOCATION_CAPACITY", "100000"))
+REVOCATION_ERROR_RATE = float(os.getenv("REVOCATION_ERROR_RATE", "0.001"))
+# Bloom filters cannot forget; rebuild from Redis to drop expired ids
+REVOCATION_REBUILD_INTERVAL = int(os.getenv("REVOCATION_REBUILD_INTERVAL", "300"))
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item)
+        )
+
+
+class RevocationList:
+    """
+    Revoked jtis: Redis is the source of truth, the Bloom filter a local index
+
+    Redis layout:
+        revoked:jti:<jti>  key with TTL = remaining token lifetime (confirm)
+        revoked:jtis       sorted set jti -> expiry (rebuilds after reconnect)
+        revoked:jti        pub/sub channel announcing new revocations
+    """
+
+    def __init__(
+        self,
+        redis_conn,
+        capacity: int = None,
+        error_rate: float = None,
+        prefix: str = "revoked",
+    ):
+        self.redis = redis_conn
+        self.capacity = capacity or REVOCATION_CAPACITY
+        self.error_rate = error_rate or REVOCATION_ERROR_RATE
+        self.prefix = prefix
+        self.bloom = BloomFilter(self.capacity, self.error_rate)
+        self.synced = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def channel(self) -> str:
+        return f"{self.prefix}:jti"
+
+    @property
+    def index_key(self) -> str:
+        return f"{self.prefix}:jtis"
+
+    def _key(self, jti: str) -> str:
+        return f"{self.prefix}:jti:{jti}"
+
+    def start(self) -> None:
+        """Start the sync thread (once, on first use, in the serving process)"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._sync, name="revocation-sync", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _reload(self) -> None:
+        """Rebuild the filter from the unexpired ids in Redis"""
+        now = time.time()
+        self.redis.zremrangebyscore(self.index_key, 0, now)
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        for jti in self.redis.zrangebyscore(self.index_key, now, "+inf"):
+            bloom.add(jti.decode())
+        self.bloom = bloom
+        self.synced.set()
+
+    def _sync(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                # Subscribe before loading, so nothing revoked in between is missed
+                pubsub.subscribe(self.channel)
+                self._reload()
+                reloaded = time.monotonic()
+                backoff = 1.0
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message:
+                        self.bloom.add(message["data"].decode())
+                    if time.monotonic() - reloaded > REVOCATION_REBUILD_INTERVAL:
+                        self._reload()
+                        reloaded = time.monotonic()
+                pubsub.close()
+            except RedisError as e:
+                logger.warning(f"Revocation sync lost, retrying in {backoff}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoke token `jti` until `expires_at` (unix time, the token's exp)"""
+        self.start()
+        ttl = max(1, int(math.ceil(expires_at - time.time())))
+        pipe = self.redis.pipeline()
+        pipe.set(self._key(jti), 1, ex=ttl)
+        pipe.zadd(self.index_key, {jti: expires_at})
+        pipe.publish(self.channel, jti)
+        pipe.execute()
+        self.bloom.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        Memory-only for filter misses. A hit is confirmed in Redis; if Redis
+        is unreachable the token is treated as revoked (fail closed).
+        Until the first sync completes every check goes to Redis, and an
+        unreachable Redis then lets signed tokens through (fail open).
+        After that, a lost connection keeps the last filter (plus local
+        revocations) until the sync thread reconnects and reloads.
+        """
+        self.start()
+        synced = self.synced.is_set()
+        if synced and jti not in self.bloom:
+            return False
+        try:
+            return bool(self.redis.exists(self._key(jti)))
+        except RedisError as e:
+            logger.warning(f"Could not confirm token revocation: {e}")
+            return synced
+
+
+revocations: Optional[RevocationList] = None
+
+
+def get_revocations() -> RevocationList:
+    """Shared revocation list (created on first use)"""
+    global revocations
+    if revocations is None:
+        from app.redis_client import get_redis
+
+        revocations = RevocationList(get_redis())
+    return revocations
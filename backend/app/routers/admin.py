@@ -0,0 +1,53 @@
+"""
+Admin endpoints - operational tooling, restricted to ADMIN_EMAILS
+"""
+
+import asyncio
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.auth import get_current_admin
+from app.logging_config import get_logger
+from app.models import User
+from app.profiler import PROFILE_MAX_SECONDS, ProfilerBusy, Sampler
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(5, ge=1, le=100),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Sample this worker process for `seconds` and return collapsed stacks
+    (flamegraph.pl / speedscope input). Only the worker serving this request
+    is profiled; with several workers, repeat the call to sample others.
+    """
+    sampler = Sampler(interval=interval_ms / 1000)
+    try:
+        sampler.start()
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    logger.info(
+        f"Profiling started for {seconds}s",
+        extra={"user_id": str(admin.id), "duration_s": seconds},
+    )
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+
+    filename = f"profile-{time.strftime('%Y%m%dT%H%M%S')}.collapsed"
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Samples": str(sampler.samples),
+        },
+    )
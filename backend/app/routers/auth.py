@@ -6,24 +6,33 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
+from redis.exceptions import RedisError
 
 from app.database import get_db
 from app.models import User
 from app.schemas import UserCreate, UserLogin, UserResponse, Token
+from app.query_stats import QueryBudget
+from app.ratelimit import RateLimit
 from app.auth import (
     get_password_hash,
     verify_password,
     create_access_token,
     get_user_by_email,
     get_current_user,
+    decode_access_token,
+    oauth2_scheme,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
+from app.revocation import get_revocations
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post(
-    "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RateLimit("register", "5/60")), Depends(QueryBudget(3))],
 )
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """
@@ -51,7 +60,11 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     return new_user
 
 
-@router.post("/login", response_model=Token)
+@router.post(
+    "/login",
+    response_model=Token,
+    dependencies=[Depends(RateLimit("login", "10/60")), Depends(QueryBudget(1))],
+)
 def login(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
@@ -85,7 +98,33 @@ def login(
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@router.get("/me", response_model=UserResponse)
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(QueryBudget(1))],
+)
+def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Revoke the access token used for this request
+    """
+    payload = decode_access_token(token)
+    if not payload.get("jti"):
+        return None  # legacy token without an id, it expires on its own
+
+    try:
+        get_revocations().revoke(payload["jti"], payload["exp"])
+    except RedisError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Logout is temporarily unavailable, try again",
+        )
+    return None
+
+
+@router.get("/me", response_model=UserResponse, dependencies=[Depends(QueryBudget(1))])
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """
     Get current logged-in user info
@@ -4,115 +4,306 @@ Task management endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional
+from sqlalchemy import or_, select, union_all
+from typing import Callable, List, Optional, Tuple
 from uuid import UUID
 
 from app.database import get_db
-from app.models import User, Task
-from app.schemas import TaskCreate, TaskUpdate, TaskResponse, PriorityEnum, StatusEnum
+from app.models import User, Task, ArchivedTask
+from app.schemas import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskStatsResponse,
+    TaskLookupRequest,
+    TaskLookupResponse,
+    PriorityEnum,
+    StatusEnum,
+)
 from app.auth import get_current_user
+from app.idempotency import Idempotency, idempotency_key
 from app.queue import enqueue_notification
+from app.serialization import (
+    FastJSONResponse,
+    dump_object,
+    dump_rows,
+    json_response,
+)
+from app.singleflight import coalesce, invalidate
+from app.query_stats import QueryBudget
+from app.ratelimit import RateLimit
+from app.replicas import get_read_db, read_source, record_write
+from app.stats import adjust_task_counter, get_task_stats, move_task_counter
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+# Query budgets below: 1 for the user lookup in get_current_user, the route's
+# own statements, and 1 for replica fencing (read check or write LSN)
 
-@router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
+# Fields served by the list endpoints, in TaskResponse order
+TASK_FIELDS = tuple(TaskResponse.model_fields)
+
+
+def task_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, e.g. id,title,status,priority",
+    ),
+) -> Tuple[str, ...]:
+    """
+    FastAPI dependency - sparse fieldset for list endpoints
+    Returns the requested fields in TaskResponse order (all fields if omitted)
+    """
+    if not fields:
+        return TASK_FIELDS
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(TASK_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(sorted(unknown))}",
+        )
+    if not requested:
+        return TASK_FIELDS
+
+    return tuple(field for field in TASK_FIELDS if field in requested)
+
+
+def select_tasks(
+    fields: Tuple[str, ...],
+    criteria: Callable[[type], list],
+    include_archived: bool = False,
+):
+    """
+    SELECT only `fields`, newest first, from tasks - and from the archive
+    table too when asked. `criteria(model)` returns the WHERE clauses.
+    """
+    if not include_archived:
+        return (
+            select(*(getattr(Task, field) for field in fields))
+            .where(*criteria(Task))
+            .order_by(Task.created_at.desc())
+        )
+
+    combined = union_all(
+        *(
+            select(
+                *(getattr(model, field) for field in fields),
+                model.created_at.label("sort_key"),
+            ).where(*criteria(model))
+            for model in (Task, ArchivedTask)
+        )
+    ).subquery()
+    return select(*(combined.c[field] for field in fields)).order_by(
+        combined.c.sort_key.desc()
+    )
+
+
+def find_task(db: Session, task_id: UUID, user_id: UUID):
+    """
+    The user's task, from tasks or else from the archive (one extra query,
+    only on a miss in tasks); None if neither has it
+    """
+    for model in (Task, ArchivedTask):
+        task = (
+            db.query(model)
+            .filter(model.id == task_id, model.user_id == user_id)
+            .first()
+        )
+        if task:
+            return task
+    return None
+
+
+@router.post(
+    "",
+    response_model=TaskResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(QueryBudget(5))],
+)
 def create_task(
     task_data: TaskCreate,
+    # Before get_current_user: duplicates wait here without a DB connection
+    idempotency: Idempotency = Depends(idempotency_key),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
     Create a new task for the current user
     Queues a background notification job (Bonus Feature: Message Queue)
+    With an Idempotency-Key header, retries create (and notify) only once.
     """
-    new_task = Task(
-        user_id=current_user.id,
-        title=task_data.title,
-        description=task_data.description,
-        priority=task_data.priority,
-        status=task_data.status,
-    )
 
-    db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
-
-    # Queue background notification (non-blocking)
-    try:
-        enqueue_notification(
-            task_id=str(new_task.id),
-            task_title=str(new_task.title),
-            user_email=str(current_user.email),
-            action="created",
+    def create() -> bytes:
+        new_task = Task(
+            user_id=current_user.id,
+            title=task_data.title,
+            description=task_data.description,
+            priority=task_data.priority,
+            status=task_data.status,
         )
-    except Exception as e:
-        # Don't fail the request if queue fails
-        print(f"Failed to queue notification: {e}")
 
-    return new_task
+        db.add(new_task)
+        adjust_task_counter(db, current_user.id, new_task.status, new_task.priority, 1)
+        db.commit()
+        record_write(db, current_user.id)
+        invalidate(str(current_user.id))
+        db.refresh(new_task)
+
+        # Queue background notification (non-blocking)
+        try:
+            enqueue_notification(
+                task_id=str(new_task.id),
+                task_title=str(new_task.title),
+                user_email=str(current_user.email),
+                action="created",
+            )
+        except Exception as e:
+            # Don't fail the request if queue fails
+            print(f"Failed to queue notification: {e}")
+
+        return dump_object(TASK_FIELDS, new_task)
+
+    return idempotency.respond(create, status.HTTP_201_CREATED)
 
 
-@router.get("", response_model=List[TaskResponse])
+@router.get(
+    "",
+    response_model=List[TaskResponse],
+    dependencies=[Depends(QueryBudget(3))],
+)
 def get_tasks(
     status: Optional[StatusEnum] = Query(None, description="Filter by status"),
     priority: Optional[PriorityEnum] = Query(None, description="Filter by priority"),
+    include_archived: bool = Query(False, description="Include archived tasks"),
+    fields: Tuple[str, ...] = Depends(task_fields),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get all tasks for current user with optional filters
+    Serialized straight from row tuples (no ORM hydration, no model validation)
+    Only the columns named in `fields` are selected and returned
+    Identical concurrent requests from the same user share one query
     """
-    query = db.query(Task).filter(Task.user_id == current_user.id)
 
-    # Apply filters
-    if status:
-        query = query.filter(Task.status == status)
-    if priority:
-        query = query.filter(Task.priority == priority)
+    def criteria(model) -> list:
+        clauses = [model.user_id == current_user.id]
+        # Apply filters
+        if status:
+            clauses.append(model.status == status)
+        if priority:
+            clauses.append(model.priority == priority)
+        return clauses
+
+    def load() -> bytes:
+        query = select_tasks(fields, criteria, include_archived)
+        return dump_rows(fields, db.execute(query).all())
 
-    tasks = query.order_by(Task.created_at.desc()).all()
-    return tasks
+    key = (
+        f"{read_source(db)}:list:{status and status.value}:"
+        f"{priority and priority.value}:{include_archived}:{fields}"
+    )
+    return json_response(coalesce(str(current_user.id), key, load))
 
 
-@router.get("/search", response_model=List[TaskResponse])
+@router.get(
+    "/search",
+    response_model=List[TaskResponse],
+    dependencies=[Depends(RateLimit("search", "30/10")), Depends(QueryBudget(3))],
+)
 def search_tasks(
     q: str = Query(..., min_length=1, description="Search query"),
+    include_archived: bool = Query(False, description="Include archived tasks"),
+    fields: Tuple[str, ...] = Depends(task_fields),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Search tasks by title or description (BONUS FEATURE)
+    Supports the same `fields` projection as the list endpoint
     """
     search_term = f"%{q}%"
-    tasks = (
-        db.query(Task)
-        .filter(
-            Task.user_id == current_user.id,
-            or_(Task.title.ilike(search_term), Task.description.ilike(search_term)),
-        )
-        .order_by(Task.created_at.desc())
-        .all()
+
+    def criteria(model) -> list:
+        return [
+            model.user_id == current_user.id,
+            or_(model.title.ilike(search_term), model.description.ilike(search_term)),
+        ]
+
+    def load() -> bytes:
+        query = select_tasks(fields, criteria, include_archived)
+        return dump_rows(fields, db.execute(query).all())
+
+    key = f"{read_source(db)}:search:{q}:{include_archived}:{fields}"
+    return json_response(coalesce(str(current_user.id), key, load))
+
+
+@router.post(
+    "/lookup",
+    response_model=TaskLookupResponse,
+    dependencies=[Depends(QueryBudget(3))],
+)
+def lookup_tasks(
+    lookup: TaskLookupRequest,
+    include_archived: bool = Query(False, description="Include archived tasks"),
+    fields: Tuple[str, ...] = Depends(task_fields),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get up to MAX_LOOKUP_IDS tasks by id in one query (hydrating ids from
+    notifications without a request per id). `id` is always returned.
+    Ids that do not exist or belong to someone else are listed in `missing`.
+    """
+    ids = list(dict.fromkeys(lookup.ids))  # dedupe, keep request order
+    if "id" not in fields:
+        fields = ("id",) + fields
+
+    def criteria(model) -> list:
+        return [model.user_id == current_user.id, model.id.in_(ids)]
+
+    rows = db.execute(select_tasks(fields, criteria, include_archived)).all()
+    found = {row[0]: row for row in rows}
+    return FastJSONResponse(
+        {
+            "items": [dict(zip(fields, found[i])) for i in ids if i in found],
+            "missing": [i for i in ids if i not in found],
+        }
     )
 
-    return tasks
+
+@router.get(
+    "/stats",
+    response_model=TaskStatsResponse,
+    dependencies=[Depends(QueryBudget(3))],
+)
+def get_stats(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Task counts by status and priority
+    Served from the per-user counters, not by scanning tasks
+    """
+    return get_task_stats(db, current_user.id)
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
+@router.get(
+    "/{task_id}",
+    response_model=TaskResponse,
+    dependencies=[Depends(QueryBudget(4))],
+)
 def get_task(
     task_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
-    Get a single task by ID
+    Get a single task by ID (archived tasks included)
     """
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.user_id == current_user.id)
-        .first()
-    )
+    task = find_task(db, task_id, current_user.id)
 
     if not task:
         raise HTTPException(
@@ -122,7 +313,11 @@ def get_task(
     return task
 
 
-@router.patch("/{task_id}", response_model=TaskResponse)
+@router.patch(
+    "/{task_id}",
+    response_model=TaskResponse,
+    dependencies=[Depends(QueryBudget(7))],
+)
 def update_task(
     task_id: UUID,
     task_update: TaskUpdate,
@@ -131,43 +326,57 @@ def update_task(
 ):
     """
     Update a task (only updates provided fields)
+    Archived tasks are read-only: 409
     """
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.user_id == current_user.id)
-        .first()
-    )
+    task = find_task(db, task_id, current_user.id)
 
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
         )
+    if isinstance(task, ArchivedTask):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Archived tasks are read-only"
+        )
+
+    old_status, old_priority = task.status, task.priority
 
     # Update only provided fields
     update_data = task_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(task, field, value)
 
+    # Move the task between counters if its status or priority changed
+    if (task.status, task.priority) != (old_status, old_priority):
+        move_task_counter(
+            db,
+            current_user.id,
+            (old_status, old_priority),
+            (task.status, task.priority),
+        )
+
     db.commit()
+    record_write(db, current_user.id)
+    invalidate(str(current_user.id))
     db.refresh(task)
 
     return task
 
 
-@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{task_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(QueryBudget(6))],
+)
 def delete_task(
     task_id: UUID,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Delete a task
+    Delete a task, archived or not (both are counted in the stats)
     """
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.user_id == current_user.id)
-        .first()
-    )
+    task = find_task(db, task_id, current_user.id)
 
     if not task:
         raise HTTPException(
@@ -175,6 +384,9 @@ def delete_task(
         )
 
     db.delete(task)
+    adjust_task_counter(db, current_user.id, task.status, task.priority, -1)
     db.commit()
+    record_write(db, current_user.id)
+    invalidate(str(current_user.id))
 
     return None
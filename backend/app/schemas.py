@@ -3,7 +3,7 @@ Pydantic schemas - API validation
 """
 
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
@@ -89,3 +89,28 @@ class TaskResponse(BaseModel):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TaskStatsResponse(BaseModel):
+    """Task counts for the dashboard"""
+
+    total: int
+    by_status: Dict[StatusEnum, int]
+    by_priority: Dict[PriorityEnum, int]
+
+
+# Most ids one POST /api/tasks/lookup may ask for
+MAX_LOOKUP_IDS = 100
+
+
+class TaskLookupRequest(BaseModel):
+    """Fetch several tasks by id in one request"""
+
+    ids: List[UUID] = Field(..., min_length=1, max_length=MAX_LOOKUP_IDS)
+
+
+class TaskLookupResponse(BaseModel):
+    """Tasks found (in request order) and ids not found for this user"""
+
+    items: List[TaskResponse]
+    missing: List[UUID]
@@ -0,0 +1,41 @@
+"""
+Fast JSON serialization - orjson responses and trusted row fast paths
+"""
+
+from typing import Any, Iterable, Sequence
+import orjson
+from fastapi.responses import ORJSONResponse, Response
+
+# UTC datetimes as "...Z" to match Pydantic's JSON output
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONResponse(ORJSONResponse):
+    """Default response class - orjson instead of stdlib json"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def dump_rows(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> bytes:
+    """
+    Encode row tuples as a JSON array of objects
+
+    Rows come straight from our own SELECT, so they are trusted: no Pydantic
+    validation pass. orjson handles UUID, datetime and str enums natively.
+    """
+    return orjson.dumps([dict(zip(fields, row)) for row in rows], option=ORJSON_OPTIONS)
+
+
+def dump_object(fields: Sequence[str], obj: Any) -> bytes:
+    """Encode the named attributes of a trusted object (e.g. an ORM row)"""
+    return orjson.dumps(
+        {field: getattr(obj, field) for field in fields}, option=ORJSON_OPTIONS
+    )
+
+
+def json_response(content: bytes, status_code: int = 200) -> Response:
+    """Response for already-encoded JSON (bypasses response_model validation)"""
+    return Response(
+        content=content, status_code=status_code, media_type="application/json"
+    )
@@ -0,0 +1,193 @@
+"""
+Request coalescing (single-flight) for identical concurrent reads
+
+Concurrent callers asking for the same key share one execution: the first
+caller (leader) runs the function, the others wait for its result. Results
+are never cached past the in-flight call.
+
+Keys are grouped by scope (the user id for task reads). Writes call
+invalidate(scope) so reads issued after a write never join a flight that
+started before it.
+
+Optionally (SINGLEFLIGHT_REDIS=true) the leaders of each replica also
+coordinate through Redis, so one query is run per burst cluster-wide. A
+follower of a remote leader polls for its result from inside the endpoint,
+i.e. holding a threadpool thread and the request's DB connection, so that
+wait is kept short (SINGLEFLIGHT_WAIT_MS): past it, running the query
+itself is cheaper than keeping the connection idle.
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+from redis.exceptions import RedisError
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SINGLEFLIGHT_REDIS = os.getenv("SINGLEFLIGHT_REDIS", "false").lower() == "true"
+# Upper bound on how long a follower waits for a remote leader (while
+# holding a thread and a DB connection) before running the query itself
+SINGLEFLIGHT_WAIT_MS = int(os.getenv("SINGLEFLIGHT_WAIT_MS", "200"))
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class _Scope:
+    __slots__ = ("generation", "leaders")
+
+    def __init__(self):
+        self.generation = 0
+        self.leaders = 0
+
+
+class SingleFlight:
+    """
+    In-process single-flight for threads (sync endpoints run in a threadpool)
+    Only scopes with a call in flight are tracked, so memory is bounded by
+    concurrency rather than by how many users ever wrote
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._scopes: Dict[str, _Scope] = {}
+
+    def invalidate(self, scope: str) -> None:
+        """Make later calls in `scope` start a new flight instead of joining"""
+        with self._lock:
+            # Without a flight in progress there is nothing to avoid joining
+            if scope in self._scopes:
+                self._scopes[scope].generation += 1
+
+    def do(self, scope: str, key: str, fn: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            state = self._scopes.setdefault(scope, _Scope())
+            flight_key = f"{scope}:{state.generation}:{key}"
+            call = self._calls.get(flight_key)
+            leader = call is None
+            if leader:
+                call = self._calls[flight_key] = _Call()
+                state.leaders += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(flight_key, None)
+                state.leaders -= 1
+                if not state.leaders:
+                    del self._scopes[scope]
+            call.done.set()
+
+
+class RedisSingleFlight:
+    """
+    Cross-replica single-flight: leader election with SET NX, result handed
+    over through a short-lived key named after the leader's token
+    """
+
+    def __init__(self, redis_conn, lock_ttl_ms: int = 10000, poll_ms: int = 10):
+        self.redis = redis_conn
+        self.lock_ttl_ms = lock_ttl_ms
+        self.poll_ms = poll_ms
+
+    def invalidate(self, scope: str) -> None:
+        self.redis.incr(f"singleflight:gen:{scope}")
+
+    def do(self, scope: str, key: str, fn: Callable[[], bytes]) -> bytes:
+        generation = int(self.redis.get(f"singleflight:gen:{scope}") or 0)
+        lock_key = f"singleflight:lock:{scope}:{generation}:{key}"
+        token = uuid.uuid4().hex
+
+        if self.redis.set(lock_key, token, nx=True, px=self.lock_ttl_ms):
+            try:
+                result = fn()
+            except BaseException:
+                self.redis.delete(lock_key)
+                raise
+
+            # Publish the result and release the lock in one round trip; a
+            # failure here only costs followers a fallback query
+            try:
+                pipe = self.redis.pipeline()
+                pipe.set(f"singleflight:result:{token}", result, px=self.lock_ttl_ms)
+                pipe.delete(lock_key)
+                pipe.execute()
+            except RedisError as e:
+                logger.warning(f"Failed to publish single-flight result: {e}")
+            return result
+
+        leader_token = self.redis.get(lock_key)
+        deadline = time.monotonic() + SINGLEFLIGHT_WAIT_MS / 1000
+        while leader_token and time.monotonic() < deadline:
+            result = self.redis.get(f"singleflight:result:{leader_token.decode()}")
+            if result is not None:
+                return result
+            if not self.redis.exists(lock_key):
+                break  # leader gave up (error) without publishing a result
+            time.sleep(self.poll_ms / 1000)
+
+        return fn()
+
+
+local_flight = SingleFlight()
+_redis_flight: Optional[RedisSingleFlight] = None
+
+
+def _get_redis_flight() -> RedisSingleFlight:
+    global _redis_flight
+    if _redis_flight is None:
+        from app.redis_client import get_redis
+
+        _redis_flight = RedisSingleFlight(get_redis())
+    return _redis_flight
+
+
+def _remote_or_local(scope: str, key: str, fn: Callable[[], bytes]) -> bytes:
+    """Coordinate the in-process leader through Redis, falling back to fn()"""
+    try:
+        return _get_redis_flight().do(scope, key, fn)
+    except RedisError as e:
+        logger.warning(f"Redis single-flight unavailable: {e}")
+        return fn()
+
+
+def coalesce(scope: str, key: str, fn: Callable[[], bytes]) -> bytes:
+    """
+    Run fn() once for all concurrent callers with the same (scope, key)
+    fn must be a pure read returning serialized bytes
+    """
+    if SINGLEFLIGHT_REDIS:
+        return local_flight.do(scope, key, lambda: _remote_or_local(scope, key, fn))
+    return local_flight.do(scope, key, fn)
+
+
+def invalidate(scope: str) -> None:
+    """Call after a committed write so later reads in `scope` see it"""
+    local_flight.invalidate(scope)
+    if SINGLEFLIGHT_REDIS:
+        try:
+            _get_redis_flight().invalidate(scope)
+        except RedisError as e:
+            logger.warning(f"Redis single-flight invalidation failed: {e}")
@@ -0,0 +1,83 @@
+"""
+Startup sequence helpers - phase timings and warm-up
+"""
+
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict
+
+from app import IMPORT_STARTED
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class StartupTimer:
+    """Times named startup phases and logs one report at the end"""
+
+    def __init__(self):
+        self.import_ms = (time.perf_counter() - IMPORT_STARTED) * 1000
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    def report(self) -> dict:
+        startup_ms = (time.perf_counter() - self.started) * 1000
+        report = {
+            "import_ms": round(self.import_ms, 2),
+            "startup_ms": round(startup_ms, 2),
+            "total_ms": round(self.import_ms + startup_ms, 2),
+            "phases": self.phases,
+        }
+        logger.info(f"Startup finished in {report['total_ms']} ms", extra=report)
+        return report
+
+
+def warm_up_validators() -> None:
+    """
+    Run each request/response schema once. Pydantic builds its validators
+    at class creation, but the first validation still pays for lazy imports
+    (email-validator, idna) and cold code paths; do that before serving.
+    """
+    from app.schemas import (
+        TaskCreate,
+        TaskResponse,
+        TaskStatsResponse,
+        TaskUpdate,
+        UserCreate,
+        UserResponse,
+    )
+
+    now = datetime.now(timezone.utc)
+    UserCreate(email="warmup@example.com", password="warmup-password")
+    UserResponse(
+        id=uuid.uuid4(),
+        email="warmup@example.com",
+        full_name=None,
+        is_active=True,
+        created_at=now,
+    ).model_dump(mode="json")
+    TaskCreate(title="warm-up")
+    TaskUpdate(status="completed")
+    TaskResponse(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        title="warm-up",
+        description=None,
+        priority="medium",
+        status="pending",
+        created_at=now,
+        updated_at=now,
+    ).model_dump(mode="json")
+    TaskStatsResponse(
+        total=0, by_status={"pending": 0}, by_priority={"low": 0}
+    ).model_dump(mode="json")
@@ -0,0 +1,158 @@
+"""
+Per-user task statistics - incrementally maintained counters
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import User, Task, ArchivedTask, TaskCounter, PriorityEnum, StatusEnum
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# UTC hour of the daily counter reconciliation (repairs drift)
+RECONCILE_HOUR_UTC = int(os.getenv("RECONCILE_HOUR_UTC", "4"))
+
+COUNTER_KEY = [TaskCounter.user_id, TaskCounter.status, TaskCounter.priority]
+
+
+def next_run_at(now: datetime = None) -> datetime:
+    """Next RECONCILE_HOUR_UTC o'clock after `now`"""
+    now = now or datetime.now(timezone.utc)
+    run_at = now.replace(hour=RECONCILE_HOUR_UTC, minute=0, second=0, microsecond=0)
+    return run_at if run_at > now else run_at + timedelta(days=1)
+
+
+def _upsert_counter(user_id, status, priority, count: int, increment: bool):
+    """INSERT ... ON CONFLICT for one counter row (add to or overwrite count)"""
+    stmt = insert(TaskCounter).values(
+        user_id=user_id, status=status, priority=priority, count=count
+    )
+    new_count = TaskCounter.count + stmt.excluded.count if increment else count
+    return stmt.on_conflict_do_update(
+        index_elements=COUNTER_KEY, set_={"count": new_count}
+    )
+
+
+def adjust_task_counter(
+    db: Session, user_id: UUID, status: str, priority: str, delta: int
+) -> None:
+    """
+    Add `delta` to one (user, status, priority) counter
+    Does not commit - call it before the commit of the task write it mirrors
+    """
+    db.execute(_upsert_counter(user_id, status, priority, delta, increment=True))
+
+
+def move_task_counter(
+    db: Session, user_id: UUID, old: Tuple[str, str], new: Tuple[str, str]
+) -> None:
+    """
+    Move one task from the `old` to the `new` (status, priority) counter
+    Rows are upserted in key order, so two moves in opposite directions lock
+    them in the same order and queue up instead of deadlocking.
+    """
+    for (status, priority), delta in sorted([(old, -1), (new, 1)]):
+        adjust_task_counter(db, user_id, status, priority, delta)
+
+
+def get_task_stats(db: Session, user_id: UUID) -> Dict:
+    """Task counts for one user - reads at most len(status) * len(priority) rows"""
+    by_status = {s.value: 0 for s in StatusEnum}
+    by_priority = {p.value: 0 for p in PriorityEnum}
+
+    rows = db.execute(
+        select(TaskCounter.status, TaskCounter.priority, TaskCounter.count).where(
+            TaskCounter.user_id == user_id
+        )
+    ).all()
+    for status, priority, count in rows:
+        by_status[status.value] += count
+        by_priority[priority.value] += count
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_priority": by_priority,
+    }
+
+
+def _actual_counts(db: Session, user_ids: Iterable[UUID]) -> Dict:
+    """
+    Counts recomputed from the task tables, keyed by (user, status, priority)
+    Archived tasks still belong to the user, so they are counted too
+    """
+    counts: Dict = {}
+    for model in (Task, ArchivedTask):
+        rows = db.execute(
+            select(model.user_id, model.status, model.priority, func.count())
+            .where(model.user_id.in_(user_ids))
+            .group_by(model.user_id, model.status, model.priority)
+        ).all()
+        for u, s, p, n in rows:
+            counts[(u, s, p)] = counts.get((u, s, p), 0) + n
+    return counts
+
+
+def reconcile_task_stats(db: Session, user_ids: Iterable[UUID]) -> int:
+    """
+    Rewrite the counters of `user_ids` from the tasks table, commit
+
+    The counter rows are locked first, so task writes racing with the
+    reconciliation wait for it and then apply their delta on top.
+    Returns the number of counters that had drifted.
+    """
+    user_ids = list(user_ids)
+    stored = {
+        (c.user_id, c.status, c.priority): c.count
+        for c in db.execute(
+            select(TaskCounter)
+            .where(TaskCounter.user_id.in_(user_ids))
+            .order_by(*COUNTER_KEY)
+            .with_for_update()
+        ).scalars()
+    }
+    actual = _actual_counts(db, user_ids)
+
+    drifted = 0
+    for key in sorted(stored.keys() | actual.keys()):  # same lock order as writes
+        expected = actual.get(key, 0)
+        if stored.get(key) == expected:
+            continue
+
+        drifted += 1
+        db.execute(_upsert_counter(*key, expected, increment=False))
+
+    db.commit()
+    return drifted
+
+
+def reconcile_all_task_stats(
+    db: Session, batch_size: int = 500, after: Optional[UUID] = None
+) -> Dict:
+    """Reconcile every user's counters in keyset-paginated batches"""
+    users = 0
+    drifted = 0
+    while True:
+        query = select(User.id).order_by(User.id).limit(batch_size)
+        if after is not None:
+            query = query.where(User.id > after)
+        batch = db.execute(query).scalars().all()
+        if not batch:
+            break
+
+        drifted += reconcile_task_stats(db, batch)
+        users += len(batch)
+        after = batch[-1]
+
+    if drifted:
+        logger.warning(
+            f"Task stats drift repaired for {drifted} counters",
+            extra={"users_checked": users, "counters_drifted": drifted},
+        )
+    return {"users_checked": users, "counters_drifted": drifted}
@@ -135,3 +135,167 @@ def process_bulk_tasks(task_ids: list):
         "processed_count": processed,
         "duration_ms": round(duration_ms, 2),
     }
+
+
+def reconcile_task_stats_job(batch_size: int = 500, reschedule: bool = True):
+    """
+    Repair drift in the per-user task counters behind GET /api/tasks/stats
+    Safe to run at any time; counters are locked per batch while rewritten.
+    Schedules tomorrow's run when it ends.
+    """
+    from app.database import SessionLocal
+    from app.stats import reconcile_all_task_stats
+
+    start_time = time.time()
+
+    current_job = get_current_job()
+    job_id = current_job.id if current_job else "unknown"
+
+    logger.info(
+        "[QUEUE] Worker picked up task stats reconciliation job",
+        extra={
+            "queue_name": "tasks",
+            "job_type": "reconcile_task_stats",
+            "job_id": job_id,
+            "queue_status": "processing",
+        },
+    )
+
+    db = SessionLocal()
+    try:
+        result = reconcile_all_task_stats(db, batch_size=batch_size)
+    finally:
+        db.close()
+        if reschedule:
+            from app.queue import schedule_reconcile
+
+            schedule_reconcile()
+
+    duration_ms = (time.time() - start_time) * 1000
+
+    logger.info(
+        "[QUEUE] Task stats reconciliation job completed",
+        extra={
+            "queue_name": "tasks",
+            "job_type": "reconcile_task_stats",
+            "job_id": job_id,
+            "duration_ms": round(duration_ms, 2),
+            "queue_status": "completed",
+            "result": "success",
+            **result,
+        },
+    )
+
+    return {"status": "completed", **result, "duration_ms": round(duration_ms, 2)}
+
+
+def archive_completed_tasks_job(
+    older_than_days: int = None, batch_size: int = 1000, reschedule: bool = True
+):
+    """
+    Move completed tasks older than ARCHIVE_AFTER_DAYS into tasks_archive
+    Runs in batches so the hot tasks table is never locked for long, then
+    schedules tomorrow's run (see `python -m app.archive schedule`)
+    """
+    from app.archive import archive_completed_tasks
+    from app.database import SessionLocal
+
+    start_time = time.time()
+
+    current_job = get_current_job()
+    job_id = current_job.id if current_job else "unknown"
+
+    logger.info(
+        "[QUEUE] Worker picked up task archival job",
+        extra={
+            "queue_name": "tasks",
+            "job_type": "archive_completed_tasks",
+            "job_id": job_id,
+            "queue_status": "processing",
+        },
+    )
+
+    db = SessionLocal()
+    try:
+        archived = archive_completed_tasks(db, older_than_days, batch_size)
+    finally:
+        db.close()
+        # Even if this run failed: whatever it left is picked up tomorrow
+        if reschedule:
+            from app.queue import schedule_archive
+
+            schedule_archive()
+
+    duration_ms = (time.time() - start_time) * 1000
+
+    logger.info(
+        f"[QUEUE] Task archival job completed - {archived} tasks archived",
+        extra={
+            "queue_name": "tasks",
+            "job_type": "archive_completed_tasks",
+            "job_id": job_id,
+            "archived_count": archived,
+            "duration_ms": round(duration_ms, 2),
+            "queue_status": "completed",
+            "result": "success",
+        },
+    )
+
+    return {
+        "status": "completed",
+        "archived_count": archived,
+        "duration_ms": round(duration_ms, 2),
+    }
+
+
+def send_digests_job(batch_size: int = None, reschedule: bool = True):
+    """
+    One digest message per user with activity since the last run
+    Resumes an interrupted run from its checkpoint and always schedules the
+    next; a failed or abandoned (killed worker) run is also retried sooner
+    """
+    from app.database import SessionLocal
+    from app.digest import run_digest
+
+    start_time = time.time()
+
+    current_job = get_current_job()
+    job_id = current_job.id if current_job else "unknown"
+
+    logger.info(
+        "[QUEUE] Worker picked up digest job",
+        extra={
+            "queue_name": "tasks",
+            "job_type": "send_digests",
+            "job_id": job_id,
+            "queue_status": "processing",
+        },
+    )
+
+    db = SessionLocal()
+    try:
+        result = run_digest(db, batch_size)
+    finally:
+        db.close()
+        # Even if this run failed: the next one resumes from its checkpoint
+        if reschedule:
+            from app.queue import schedule_digest
+
+            schedule_digest()
+
+    duration_ms = (time.time() - start_time) * 1000
+
+    logger.info(
+        f"[QUEUE] Digest job completed - {result['digests_sent']} digests sent",
+        extra={
+            "queue_name": "tasks",
+            "job_type": "send_digests",
+            "job_id": job_id,
+            "duration_ms": round(duration_ms, 2),
+            "queue_status": "completed",
+            "result": "success",
+            **result,
+        },
+    )
+
+    return {"status": "completed", **result, "duration_ms": round(duration_ms, 2)}
@@ -0,0 +1,3 @@
+"""
+Benchmarks - run as modules from backend/, e.g. python -m benchmarks.bench_serialization
+"""
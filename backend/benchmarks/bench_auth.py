@@ -0,0 +1,93 @@
+"""
+Per-request authentication overhead
+
+Times what get_current_user does before its user lookup, per request:
+  jose decode     - python-jose HS256 verify + JSON parse (no cache)
+  cached decode   - decode_access_token with a warm JWT_CACHE_SIZE cache
+  + revocation    - cached decode plus the in-memory revocation check
+
+Usage (from backend/):
+    python -m benchmarks.bench_auth --tokens 1 100 --iterations 20000
+"""
+
+import argparse
+import json
+import time
+
+import fakeredis
+
+from app import auth
+from app.auth import DecodedTokenCache, create_access_token, decode_access_token
+from app.revocation import RevocationList
+
+
+def per_call_us(fn, tokens: list, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(tokens[i % len(tokens)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run(token_counts: list, iterations: int) -> list:
+    revocations = RevocationList(fakeredis.FakeRedis(), capacity=100000)
+    revocations.start()
+    revocations.synced.wait(5)
+    results = []
+
+    for count in token_counts:
+        tokens = [
+            create_access_token({"sub": f"user{i}@example.com"}) for i in range(count)
+        ]
+
+        auth.token_cache = DecodedTokenCache(0)
+        uncached = per_call_us(decode_access_token, tokens, iterations)
+
+        auth.token_cache = DecodedTokenCache(max(count, 1))
+        cached = per_call_us(decode_access_token, tokens, iterations)
+
+        def with_revocation(token):
+            claims = decode_access_token(token)
+            return revocations.is_revoked(claims["jti"])
+
+        full = per_call_us(with_revocation, tokens, iterations)
+
+        for mode, us in (
+            ("jose decode", uncached),
+            ("cached decode", cached),
+            ("+ revocation", full),
+        ):
+            results.append(
+                {
+                    "tokens": count,
+                    "mode": mode,
+                    "us_per_request": round(us, 2),
+                    "speedup": round(uncached / us, 1),
+                }
+            )
+
+    revocations.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auth overhead per request")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.tokens, args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'tokens':>8} {'mode':<15} {'us/request':>11} {'speedup':>8}")
+    for r in results:
+        print(
+            f"{r['tokens']:>8} {r['mode']:<15} {r['us_per_request']:>11.2f} "
+            f"{r['speedup']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
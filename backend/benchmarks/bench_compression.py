@@ -0,0 +1,80 @@
+"""
+Compression of task list payloads - bytes saved vs CPU per codec and level
+
+Encodes synthetic task lists the way the list endpoint does (dump_rows) and
+compresses them with every installed codec (gzip always; br and zstd when
+`brotli` / `zstandard` are installed) at a few levels.
+
+Usage (from backend/):
+    python -m benchmarks.bench_compression --sizes 10 100 1000 10000
+"""
+
+import argparse
+import json
+
+from app.compression import brotli, brotli_encode, gzip_encode, zstandard, zstd_encode
+from app.serialization import dump_rows
+from benchmarks.bench_serialization import FIELDS, best_of, make_rows
+
+LEVELS = {
+    "gzip": (gzip_encode, [1, 5, 9]),
+    "br": (brotli_encode, [1, 4, 11]),
+    "zstd": (zstd_encode, [1, 3, 9]),
+}
+
+
+def run(sizes: list, repeat: int) -> list:
+    codecs = {"gzip": LEVELS["gzip"]}
+    if brotli is not None:
+        codecs["br"] = LEVELS["br"]
+    if zstandard is not None:
+        codecs["zstd"] = LEVELS["zstd"]
+
+    results = []
+    for size in sizes:
+        body = dump_rows(FIELDS, make_rows(size))
+        for codec, (encode, levels) in codecs.items():
+            for level in levels:
+                ms = best_of(lambda: encode(body, level), repeat)
+                compressed = len(encode(body, level))
+                results.append(
+                    {
+                        "size": size,
+                        "codec": codec,
+                        "level": level,
+                        "bytes": len(body),
+                        "compressed_bytes": compressed,
+                        "ratio": round(len(body) / compressed, 1),
+                        "ms": round(ms, 3),
+                        "mb_per_s": round(len(body) / 1e6 / (ms / 1000), 1),
+                    }
+                )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(
+        f"{'size':>6} {'codec':<5} {'level':>5} {'bytes':>10} {'compressed':>10} "
+        f"{'ratio':>6} {'ms':>9} {'MB/s':>8}"
+    )
+    for r in results:
+        print(
+            f"{r['size']:>6} {r['codec']:<5} {r['level']:>5} {r['bytes']:>10} "
+            f"{r['compressed_bytes']:>10} {r['ratio']:>5}x {r['ms']:>9.3f} "
+            f"{r['mb_per_s']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
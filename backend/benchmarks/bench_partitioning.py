@@ -0,0 +1,170 @@
+"""
+Plain vs hash-partitioned tasks table at scale
+
+Seeds the same synthetic data into two scratch schemas, one with a plain
+heap table and one hash-partitioned on user_id, then reports index sizes,
+the largest single index/partition and list-query latency per user.
+
+Usage (from backend/, against a disposable database):
+    python -m benchmarks.bench_partitioning --rows 50000000 --users 100000
+    python -m benchmarks.bench_partitioning --rows 1000000 --json > part.json
+
+Seeding 50M rows takes a while and needs roughly 15 GB per layout.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+from app.database import DATABASE_URL
+
+LAYOUTS = {
+    "plain": "",
+    "hash": "PARTITION BY HASH (user_id)",
+}
+
+TABLE = """
+CREATE TABLE {schema}.tasks (
+    id uuid NOT NULL,
+    user_id uuid NOT NULL,
+    title varchar(255) NOT NULL,
+    description text,
+    priority varchar(10) NOT NULL,
+    status varchar(12) NOT NULL,
+    created_at timestamptz DEFAULT now(),
+    updated_at timestamptz DEFAULT now(),
+    PRIMARY KEY (id, user_id)
+) {partition_by}
+"""
+
+# Users are derived from a seeded integer so both layouts get identical data
+SEED = """
+INSERT INTO {schema}.tasks
+SELECT gen_random_uuid(),
+       md5('user' || (g % :users))::uuid,
+       'Task ' || g,
+       repeat('lorem ipsum ', (g % 20)),
+       (ARRAY['low', 'medium', 'high'])[1 + g % 3],
+       (ARRAY['pending', 'in-progress', 'completed'])[1 + g % 3],
+       now() - (g % 100000) * interval '1 minute',
+       now()
+FROM generate_series(:start, :stop) AS g
+"""
+
+LIST_QUERY = """
+SELECT id, user_id, title, description, priority, status, created_at, updated_at
+FROM {schema}.tasks WHERE user_id = md5('user' || :user)::uuid
+ORDER BY created_at DESC
+"""
+
+INDEX_SIZES = """
+SELECT coalesce(sum(pg_relation_size(i.indexrelid)), 0),
+       coalesce(max(pg_relation_size(i.indexrelid)), 0)
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = :schema
+"""
+
+
+def seed(conn, schema: str, layout: str, args) -> float:
+    start = time.perf_counter()
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {schema}"))
+    conn.execute(text(TABLE.format(schema=schema, partition_by=LAYOUTS[layout])))
+    if layout == "hash":
+        for i in range(args.partitions):
+            conn.execute(
+                text(
+                    f"CREATE TABLE {schema}.tasks_p{i} PARTITION OF {schema}.tasks "
+                    f"FOR VALUES WITH (MODULUS {args.partitions}, REMAINDER {i})"
+                )
+            )
+
+    for chunk_start in range(0, args.rows, args.chunk):
+        conn.execute(
+            text(SEED.format(schema=schema)),
+            {
+                "users": args.users,
+                "start": chunk_start,
+                "stop": min(chunk_start + args.chunk, args.rows) - 1,
+            },
+        )
+        conn.commit()
+
+    conn.execute(text(f"CREATE INDEX ON {schema}.tasks (user_id, created_at DESC)"))
+    conn.execute(text(f"ANALYZE {schema}.tasks"))
+    conn.commit()
+    return time.perf_counter() - start
+
+
+def measure(conn, schema: str, args) -> dict:
+    total_index, largest_index = conn.execute(
+        text(INDEX_SIZES), {"schema": schema}
+    ).one()
+
+    query = text(LIST_QUERY.format(schema=schema))
+    rng = random.Random(42)  # same users for every layout
+    users = [rng.randrange(args.users) for _ in range(args.queries)]
+    for user in users[:50]:  # warm the cache
+        conn.execute(query, {"user": user}).all()
+
+    timings = []
+    for user in users:
+        start = time.perf_counter()
+        conn.execute(query, {"user": user}).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    return {
+        "index_bytes_total": int(total_index),
+        "index_bytes_largest": int(largest_index),
+        "list_ms_p50": round(statistics.median(timings), 3),
+        "list_ms_p95": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "list_ms_p99": round(timings[int(len(timings) * 0.99) - 1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plain vs partitioned tasks table")
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--chunk", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--keep", action="store_true", help="Keep scratch schemas")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    results = {}
+    with engine.connect() as conn:
+        for layout in LAYOUTS:
+            schema = f"bench_tasks_{layout}"
+            seconds = seed(conn, schema, layout, args)
+            results[layout] = {"seed_seconds": round(seconds, 1)}
+            results[layout].update(measure(conn, schema, args))
+            if not args.keep:
+                conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+                conn.commit()
+
+    if args.json:
+        print(json.dumps({"rows": args.rows, "users": args.users, **results}))
+        return
+
+    print(f"rows={args.rows} users={args.users} partitions={args.partitions}")
+    for layout, r in results.items():
+        print(
+            f"{layout:>6}: index total {r['index_bytes_total'] / 2**20:,.0f} MiB, "
+            f"largest {r['index_bytes_largest'] / 2**20:,.0f} MiB | list p50 "
+            f"{r['list_ms_p50']} ms p95 {r['list_ms_p95']} ms p99 {r['list_ms_p99']} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Serialization benchmark for task list endpoints
+
+Compares the three ways a list of tasks can be turned into response bytes:
+  pydantic+json   - FastAPI default: validate ORM objects, stdlib json encode
+  pydantic+orjson - same validation pass, orjson encode (FastJSONResponse)
+  rows+orjson     - trusted fast path: row tuples straight to orjson
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --sizes 100 1000 10000
+"""
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.models import PriorityEnum, StatusEnum
+from app.schemas import TaskResponse
+from app.serialization import FastJSONResponse, dump_rows
+
+FIELDS = tuple(TaskResponse.model_fields)
+
+
+def make_rows(n: int) -> list:
+    """Build n task rows shaped like the list endpoint SELECT"""
+    user_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    priorities = list(PriorityEnum)
+    statuses = list(StatusEnum)
+    return [
+        (
+            uuid.uuid4(),
+            user_id,
+            f"Task {i}",
+            "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 3,
+            priorities[i % len(priorities)],
+            statuses[i % len(statuses)],
+            now - timedelta(minutes=i),
+            now,
+        )
+        for i in range(n)
+    ]
+
+
+def best_of(fn, repeat: int) -> float:
+    """Best wall time in milliseconds over `repeat` runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def run(sizes: List[int], repeat: int) -> list:
+    adapter = TypeAdapter(List[TaskResponse])
+    orjson_response = FastJSONResponse(content=None)
+    results = []
+
+    for size in sizes:
+        rows = make_rows(size)
+        objects = [SimpleNamespace(**dict(zip(FIELDS, row))) for row in rows]
+
+        def pydantic_json():
+            validated = adapter.validate_python(objects, from_attributes=True)
+            return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+        def pydantic_orjson():
+            validated = adapter.validate_python(objects, from_attributes=True)
+            return orjson_response.render(adapter.dump_python(validated, mode="json"))
+
+        def rows_orjson():
+            return dump_rows(FIELDS, rows)
+
+        baseline = best_of(pydantic_json, repeat)
+        for name, fn in (
+            ("pydantic+json", pydantic_json),
+            ("pydantic+orjson", pydantic_orjson),
+            ("rows+orjson", rows_orjson),
+        ):
+            ms = baseline if fn is pydantic_json else best_of(fn, repeat)
+            results.append(
+                {
+                    "size": size,
+                    "mode": name,
+                    "ms": round(ms, 3),
+                    "speedup": round(baseline / ms, 2) if ms else None,
+                    "bytes": len(fn()),
+                }
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'size':>8} {'mode':<16} {'ms':>10} {'speedup':>8} {'bytes':>10}")
+    for r in results:
+        print(
+            f"{r['size']:>8} {r['mode']:<16} {r['ms']:>10.3f} "
+            f"{r['speedup']:>7.2f}x {r['bytes']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
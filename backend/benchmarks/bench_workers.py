@@ -0,0 +1,141 @@
+"""
+Throughput vs number of gunicorn workers on one host
+
+Starts gunicorn (gunicorn.conf.py) with 1, 2, 4, ... workers, drives it over
+real HTTP from separate load-generator processes and reports RPS and
+latency percentiles per worker count. Load generators compete with the
+server for CPU, so leave cores for them (--max-workers below core count).
+
+Usage (from backend/, with docker compose's db and redis running):
+    python -m benchmarks.bench_workers
+    python -m benchmarks.bench_workers --path /api/tasks --token <jwt> --json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.load_test import summarize
+
+
+def wait_until_up(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up")
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        WEB_CONCURRENCY=str(workers),
+        BIND=f"127.0.0.1:{port}",
+        LOG_LEVEL="WARNING",
+        RATE_LIMIT_ENABLED="false",
+        SHED_MAX_IN_FLIGHT="100000",
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        env=env,
+    )
+
+
+def generate_load(args: tuple) -> tuple:
+    """One load-generator process: `concurrency` keep-alive clients"""
+    url, headers, concurrency, seconds = args
+
+    async def run():
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + seconds
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(limits=limits, headers=headers) as client:
+
+            async def worker():
+                nonlocal errors
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    try:
+                        response = await client.get(url)
+                        if response.status_code >= 400:
+                            errors += 1
+                    except httpx.TransportError:
+                        errors += 1
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors
+
+    return asyncio.run(run())
+
+
+def measure(url: str, headers: dict, args) -> dict:
+    jobs = [(url, headers, args.concurrency, args.seconds)] * args.clients
+    with multiprocessing.Pool(args.clients) as pool:
+        start = time.perf_counter()
+        results = pool.map(generate_load, jobs)
+        elapsed = time.perf_counter() - start
+    latencies = [ms for client_latencies, _ in results for ms in client_latencies]
+    return summarize(latencies, sum(errors for _, errors in results), elapsed)
+
+
+def main():
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else 1
+    parser = argparse.ArgumentParser(description="Throughput per worker count")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--token", help="Bearer token for authenticated paths")
+    parser.add_argument("--max-workers", type=int, default=max(1, cores // 2))
+    parser.add_argument("--clients", type=int, default=max(1, cores // 2))
+    parser.add_argument("--concurrency", type=int, default=32, help="Per client")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    base_url = f"http://127.0.0.1:{args.port}"
+    counts = []
+    n = 1
+    while n < args.max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(args.max_workers)
+
+    results = {}
+    for workers in counts:
+        server = start_server(workers, args.port)
+        try:
+            wait_until_up(base_url)
+            results[workers] = measure(f"{base_url}{args.path}", headers, args)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+    if args.json:
+        print(json.dumps({"path": args.path, "cores": cores, "workers": results}))
+        return
+
+    baseline = results[counts[0]]["rps"] or 1
+    print(f"path={args.path} cores={cores} clients={args.clients}x{args.concurrency}")
+    for workers, r in results.items():
+        print(
+            f"workers={workers:>3} rps={r['rps']:>9} ({r['rps'] / baseline:.2f}x) "
+            f"p50={r['p50_ms']}ms p95={r['p95_ms']}ms p99={r['p99_ms']}ms "
+            f"errors={r['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
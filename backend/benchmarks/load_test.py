@@ -0,0 +1,336 @@
+"""
+In-process load test for the API and the RQ worker
+
+Seeds a local Postgres with realistic data sizes, drives the real app through
+an ASGI client (no network, no uvicorn) at fixed concurrency levels, and
+measures RQ enqueue and job throughput against the local Redis.
+Results are written as JSON; pass --compare to flag regressions against an
+earlier run.
+
+Usage (from backend/, with docker compose's db and redis running):
+    python -m benchmarks.load_test --sizes 1000 100000 1000000 --output run.json
+    python -m benchmarks.load_test --sizes 1000 --compare run.json
+
+Seeded users are named bench-*@bench.local and removed at the end of each
+size unless --keep is given. Do not point this at a production database.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import text
+
+from app import ratelimit
+from app.auth import create_access_token, get_password_hash
+from app.database import engine, init_db
+from app.main import app
+
+BENCH_PASSWORD = "bench-password"
+
+SEED_USERS = """
+INSERT INTO users (id, email, hashed_password, full_name, is_active)
+SELECT gen_random_uuid(), 'bench-' || g || '@bench.local', :hash, 'Bench ' || g, true
+FROM generate_series(1, :users) AS g
+"""
+
+SEED_TASKS = """
+INSERT INTO tasks (id, user_id, title, description, priority, status, created_at, updated_at)
+SELECT gen_random_uuid(), u.id, 'Task ' || g || ' for ' || u.full_name,
+       repeat('Realistic task description text. ', 1 + g % 8),
+       (ARRAY['low', 'medium', 'high'])[1 + g % 3]::priorityenum,
+       (ARRAY['pending', 'in_progress', 'completed'])[1 + (g / 3) % 3]::statusenum,
+       now() - g * interval '1 minute', now()
+FROM users u CROSS JOIN generate_series(1, :per_user) AS g
+WHERE u.email LIKE 'bench-%@bench.local'
+"""
+
+SEED_COUNTERS = """
+INSERT INTO task_counters (user_id, status, priority, count)
+SELECT t.user_id, t.status, t.priority, count(*)
+FROM tasks t JOIN users u ON u.id = t.user_id
+WHERE u.email LIKE 'bench-%@bench.local'
+GROUP BY t.user_id, t.status, t.priority
+"""
+
+# (name, method, path, share of requests in the mixed scenario)
+ENDPOINTS = [
+    ("list", "GET", "/api/tasks", 0.35),
+    ("list_filtered", "GET", "/api/tasks?status=pending&priority=high", 0.15),
+    ("list_sparse", "GET", "/api/tasks?fields=id,title,status,priority", 0.15),
+    ("search", "GET", "/api/tasks/search?q=Task%201", 0.10),
+    ("stats", "GET", "/api/tasks/stats", 0.10),
+    ("get", "GET", "/api/tasks/{task_id}", 0.10),
+    ("create", "POST", "/api/tasks", 0.05),
+]
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[max(index, 0)]
+
+
+def summarize(latencies_ms: list, errors: int, elapsed: float) -> dict:
+    latencies_ms.sort()
+    return {
+        "requests": len(latencies_ms),
+        "errors": errors,
+        "rps": round(len(latencies_ms) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies_ms), 2) if latencies_ms else 0.0,
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+    }
+
+
+# ----------------------------------------------------------------------------
+# Seeding
+# ----------------------------------------------------------------------------
+
+
+def reset():
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE email LIKE 'bench-%@bench.local'"))
+
+
+def seed(total_tasks: int, tasks_per_user: int) -> dict:
+    """Create bench users and their tasks, return tokens and sample task ids"""
+    users = max(1, total_tasks // tasks_per_user)
+    per_user = max(1, total_tasks // users)
+    start = time.perf_counter()
+
+    reset()
+    with engine.begin() as conn:
+        conn.execute(
+            text(SEED_USERS),
+            {"hash": get_password_hash(BENCH_PASSWORD), "users": users},
+        )
+        conn.execute(text(SEED_TASKS), {"per_user": per_user})
+        conn.execute(text(SEED_COUNTERS))
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE users"))
+        conn.execute(text("ANALYZE tasks"))
+        emails = conn.execute(
+            text(
+                "SELECT email FROM users WHERE email LIKE 'bench-%@bench.local' "
+                "ORDER BY random() LIMIT 200"
+            )
+        ).scalars()
+        tokens = [create_access_token({"sub": email}) for email in emails]
+        samples = conn.execute(
+            text(
+                "SELECT u.email, t.id FROM tasks t JOIN users u ON u.id = t.user_id "
+                "WHERE u.email LIKE 'bench-%@bench.local' ORDER BY random() LIMIT 200"
+            )
+        ).all()
+
+    return {
+        "users": users,
+        "tasks": users * per_user,
+        "seed_seconds": round(time.perf_counter() - start, 1),
+        "tokens": tokens,
+        "owned_tasks": [
+            (create_access_token({"sub": email}), str(task_id))
+            for email, task_id in samples
+        ],
+    }
+
+
+# ----------------------------------------------------------------------------
+# HTTP load
+# ----------------------------------------------------------------------------
+
+
+def build_request(endpoint, data: dict, rng: random.Random):
+    _, method, path, _ = endpoint
+    if "{task_id}" in path:
+        token, task_id = rng.choice(data["owned_tasks"])
+        path = path.format(task_id=task_id)
+    else:
+        token = rng.choice(data["tokens"])
+    body = None
+    if method == "POST":
+        body = {"title": f"Load test {rng.random():.6f}", "priority": "medium"}
+    return method, path, {"Authorization": f"Bearer {token}"}, body
+
+
+async def drive(endpoints, data, concurrency: int, requests: int) -> dict:
+    """Fire `requests` requests with `concurrency` workers, latency per endpoint"""
+    weights = [endpoint[3] for endpoint in endpoints]
+    latencies = {endpoint[0]: [] for endpoint in endpoints}
+    errors = {endpoint[0]: 0 for endpoint in endpoints}
+    remaining = requests
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def worker(seed_value: int):
+            nonlocal remaining
+            rng = random.Random(seed_value)
+            while remaining > 0:
+                remaining -= 1
+                endpoint = rng.choices(endpoints, weights)[0]
+                method, path, headers, body = build_request(endpoint, data, rng)
+                start = time.perf_counter()
+                response = await client.request(
+                    method, path, headers=headers, json=body
+                )
+                latencies[endpoint[0]].append((time.perf_counter() - start) * 1000)
+                if response.status_code >= 400:
+                    errors[endpoint[0]] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    results = {
+        name: summarize(latencies[name], errors[name], elapsed) for name in latencies
+    }
+    results["_all"] = summarize(
+        [ms for values in latencies.values() for ms in values],
+        sum(errors.values()),
+        elapsed,
+    )
+    return results
+
+
+# ----------------------------------------------------------------------------
+# RQ throughput
+# ----------------------------------------------------------------------------
+
+
+def noop_job(n: int) -> int:
+    """Trivial job - measures queue overhead, not job work"""
+    return n
+
+
+def bench_queue(jobs: int) -> dict:
+    from rq import Queue, SimpleWorker
+
+    from app.redis_client import get_redis
+
+    redis_conn = get_redis()
+    queue = Queue("bench", connection=redis_conn)
+    queue.empty()
+
+    start = time.perf_counter()
+    for i in range(jobs):
+        queue.enqueue(noop_job, i)
+    enqueue_seconds = time.perf_counter() - start
+
+    worker = SimpleWorker([queue], connection=redis_conn)
+    start = time.perf_counter()
+    worker.work(burst=True, logging_level="WARNING")
+    work_seconds = time.perf_counter() - start
+    queue.empty()
+
+    return {
+        "jobs": jobs,
+        "enqueue_per_second": round(jobs / enqueue_seconds, 1),
+        "jobs_per_second": round(jobs / work_seconds, 1),
+    }
+
+
+# ----------------------------------------------------------------------------
+# Comparison
+# ----------------------------------------------------------------------------
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Endpoints whose p95 grew or rps dropped by more than `threshold`"""
+    regressions = []
+    for size, levels in current["http"].items():
+        for concurrency, endpoints in levels.items():
+            for name, now in endpoints.items():
+                before = (
+                    baseline.get("http", {})
+                    .get(size, {})
+                    .get(concurrency, {})
+                    .get(name)
+                )
+                if not before:
+                    continue
+                where = f"size={size} c={concurrency} {name}"
+                if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (
+                    1 + threshold
+                ):
+                    regressions.append(
+                        f"{where}: p95 {before['p95_ms']} -> {now['p95_ms']} ms"
+                    )
+                if before["rps"] and now["rps"] < before["rps"] * (1 - threshold):
+                    regressions.append(f"{where}: rps {before['rps']} -> {now['rps']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API and worker load test")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--tasks-per-user", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--queue-jobs", type=int, default=2000)
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--keep", action="store_true", help="Keep seeded data")
+    args = parser.parse_args()
+
+    # Measure the app, not the limiter
+    ratelimit.RATE_LIMIT_ENABLED = False
+    init_db()
+    results = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "requests_per_level": args.requests,
+        "seed": {},
+        "http": {},
+    }
+
+    for size in args.sizes:
+        data = seed(size, args.tasks_per_user)
+        results["seed"][str(size)] = {
+            k: data[k] for k in ("users", "tasks", "seed_seconds")
+        }
+        results["http"][str(size)] = {}
+        for concurrency in args.concurrency:
+            level = asyncio.run(drive(ENDPOINTS, data, concurrency, args.requests))
+            results["http"][str(size)][str(concurrency)] = level
+            overall = level["_all"]
+            print(
+                f"size={size:>8} c={concurrency:>3} rps={overall['rps']:>8} "
+                f"p50={overall['p50_ms']}ms p95={overall['p95_ms']}ms "
+                f"p99={overall['p99_ms']}ms errors={overall['errors']}"
+            )
+        if not args.keep:
+            reset()
+
+    results["queue"] = bench_queue(args.queue_jobs)
+    print(f"queue: {results['queue']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Archival scheduling tests (archive_batch itself needs Postgres)
+"""
+
+from datetime import datetime, timezone
+
+import fakeredis
+import pytest
+from rq import Queue
+
+from app import archive, queue
+from app.workers.tasks import archive_completed_tasks_job
+
+
+def test_next_run_is_the_coming_archive_hour(monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_HOUR_UTC", 3)
+
+    before = datetime(2025, 1, 10, 2, 59, tzinfo=timezone.utc)
+    after = datetime(2025, 1, 10, 3, 0, tzinfo=timezone.utc)
+
+    assert archive.next_run_at(before) == datetime(2025, 1, 10, 3, tzinfo=timezone.utc)
+    assert archive.next_run_at(after) == datetime(2025, 1, 11, 3, tzinfo=timezone.utc)
+
+
+def test_failed_run_still_schedules_the_next(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(archive, "archive_completed_tasks", lambda *args: 1 / 0)
+    monkeypatch.setattr(queue, "schedule_archive", lambda: scheduled.append(True))
+
+    with pytest.raises(ZeroDivisionError):
+        archive_completed_tasks_job()
+    assert scheduled == [True]
+
+
+def test_schedule_archive_enqueues_one_job_per_night(monkeypatch):
+    task_queue = Queue("tasks", connection=fakeredis.FakeRedis())
+    monkeypatch.setattr(queue, "get_task_queue", lambda: task_queue)
+
+    run_at = queue.schedule_archive()
+    queue.schedule_archive()
+
+    assert task_queue.scheduled_job_registry.get_job_ids() == [
+        f"archive-{run_at:%Y%m%dT%H%M}"
+    ]
+    assert (
+        task_queue.scheduled_job_registry.get_scheduled_time(
+            f"archive-{run_at:%Y%m%dT%H%M}"
+        )
+        == run_at
+    )
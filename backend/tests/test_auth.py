@@ -0,0 +1,62 @@
+"""
+JWT decode cache tests
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+from jose import JWTError
+
+from app import auth
+from app.auth import DecodedTokenCache, create_access_token, decode_access_token
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(auth, "token_cache", DecodedTokenCache(2))
+
+
+def test_repeated_decode_skips_verification(monkeypatch):
+    token = create_access_token({"sub": "user@example.com"})
+    claims = decode_access_token(token)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("token verified again")
+
+    monkeypatch.setattr(auth.jwt, "decode", fail)
+    assert decode_access_token(token) == claims
+
+
+def test_tampered_token_is_rejected_even_after_caching():
+    token = create_access_token({"sub": "user@example.com"})
+    decode_access_token(token)
+
+    with pytest.raises(JWTError):
+        decode_access_token(token[:-2] + ("AA" if token[-2:] != "AA" else "BB"))
+
+
+def test_expired_claims_are_not_served():
+    cache = DecodedTokenCache(10)
+    cache.put(b"k", {"sub": "user@example.com", "exp": time.time() - 1})
+
+    assert cache.get(b"k") is None
+
+
+def test_expired_token_is_rejected():
+    token = create_access_token({"sub": "u"}, expires_delta=timedelta(seconds=-1))
+
+    with pytest.raises(JWTError):
+        decode_access_token(token)
+
+
+def test_cache_is_bounded_lru():
+    cache = DecodedTokenCache(2)
+    exp = time.time() + 60
+    for key in (b"a", b"b"):
+        cache.put(key, {"exp": exp})
+    cache.get(b"a")
+    cache.put(b"c", {"exp": exp})
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") and cache.get(b"c")
@@ -0,0 +1,99 @@
+"""
+Response compression tests
+"""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app import compression
+from app.compression import choose_encoding
+from app.middleware import CompressionMiddleware
+
+TASKS = [
+    {"id": i, "title": f"Task {i}", "priority": "medium", "status": "pending"}
+    for i in range(200)
+]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/tasks")
+    def tasks():
+        return TASKS
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (b"x" * 4096 for _ in range(3)), media_type="text/plain"
+        )
+
+    return TestClient(app)
+
+
+def raw_get(client, path, accept_encoding):
+    # Ask httpx not to decode, so we see what went over the wire
+    with client.stream(
+        "GET", path, headers={"Accept-Encoding": accept_encoding}
+    ) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_large_json_is_gzipped(client):
+    response, body = raw_get(client, "/tasks", "gzip")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) == len(body)
+    assert gzip.decompress(body) == client.get("/tasks").content
+    assert len(body) * 5 < len(gzip.decompress(body))
+
+
+def test_small_and_unaccepted_bodies_are_not_compressed(client):
+    small, _ = raw_get(client, "/small", "gzip")
+    identity, _ = raw_get(client, "/tasks", "identity")
+    refused, _ = raw_get(client, "/tasks", "gzip;q=0")
+
+    for response in (small, identity, refused):
+        assert "Content-Encoding" not in response.headers
+
+
+def test_streaming_response_passes_through(client):
+    response, body = raw_get(client, "/stream", "gzip")
+
+    assert "Content-Encoding" not in response.headers
+    assert body == b"x" * 4096 * 3
+
+
+def test_large_bodies_are_compressed_off_the_event_loop(client, monkeypatch):
+    calls = []
+
+    async def fake_threadpool(fn, *args):
+        calls.append(fn)
+        return fn(*args)
+
+    monkeypatch.setattr(compression, "COMPRESSION_THREADPOOL_SIZE", 1)
+    monkeypatch.setattr("app.middleware.run_in_threadpool", fake_threadpool)
+    raw_get(client, "/tasks", "gzip")
+
+    assert calls == [compression.gzip_encode]
+
+
+def test_negotiation_honours_q_values():
+    encoders = {"zstd": None, "br": None, "gzip": None}
+
+    assert choose_encoding("gzip, br", encoders) == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5", encoders) == "gzip"
+    assert choose_encoding("*", encoders) == "zstd"
+    assert choose_encoding("*;q=0, gzip;q=0", encoders) is None
+    assert choose_encoding("", encoders) is None
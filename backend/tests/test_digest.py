@@ -0,0 +1,65 @@
+"""
+Digest scheduling tests (the digest SQL itself needs Postgres)
+"""
+
+from datetime import datetime, timezone
+
+import fakeredis
+import pytest
+from rq import Queue
+
+from app import digest, queue
+from app.workers.tasks import send_digests_job
+
+
+def test_next_run_is_the_coming_digest_hour(monkeypatch):
+    monkeypatch.setattr(digest, "DIGEST_HOUR_UTC", 7)
+
+    before = datetime(2025, 1, 10, 6, 30, tzinfo=timezone.utc)
+    after = datetime(2025, 1, 10, 7, 0, tzinfo=timezone.utc)
+
+    assert digest.next_run_at(before) == datetime(2025, 1, 10, 7, tzinfo=timezone.utc)
+    assert digest.next_run_at(after) == datetime(2025, 1, 11, 7, tzinfo=timezone.utc)
+
+
+def test_runs_follow_the_interval_grid(monkeypatch):
+    monkeypatch.setattr(digest, "DIGEST_HOUR_UTC", 7)
+    monkeypatch.setattr(digest, "DIGEST_INTERVAL_HOURS", 6)
+
+    now = datetime(2025, 1, 10, 14, 0, tzinfo=timezone.utc)
+    assert digest.next_run_at(now) == datetime(2025, 1, 10, 19, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(digest, "DIGEST_INTERVAL_HOURS", 48)
+    first = digest.next_run_at(now)
+    assert first.hour == 7
+    assert (digest.next_run_at(first) - first).days == 2
+
+
+def test_failed_run_still_schedules_the_next(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(digest, "run_digest", lambda db, batch_size: 1 / 0)
+    monkeypatch.setattr(queue, "schedule_digest", lambda: scheduled.append(True))
+
+    with pytest.raises(ZeroDivisionError):
+        send_digests_job()
+    assert scheduled == [True]
+
+
+def test_scheduled_run_is_retried(monkeypatch):
+    task_queue = Queue("tasks", connection=fakeredis.FakeRedis())
+    monkeypatch.setattr(queue, "get_task_queue", lambda: task_queue)
+
+    run_at = queue.schedule_digest()
+
+    job = task_queue.fetch_job(f"digest-{run_at:%Y%m%dT%H%M}")
+    assert job.retries_left == 3
+    assert task_queue.scheduled_job_registry.get_scheduled_time(job) == run_at
+
+
+def test_digest_mode_skips_per_action_notifications(monkeypatch):
+    monkeypatch.setattr(queue, "NOTIFICATION_MODE", "digest")
+    monkeypatch.setattr(queue, "get_task_queue", lambda: 1 / 0)  # must not enqueue
+
+    assert (
+        queue.enqueue_notification("id", "title", "user@example.com", "created") is None
+    )
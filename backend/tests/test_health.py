@@ -2,6 +2,12 @@
 Health check endpoint tests
 """
 
+import fakeredis
+import pytest
+
+from app import main
+from app.readiness import ReadinessProbe
+
 
 def test_root_endpoint(client):
     """Test root endpoint returns API info"""
@@ -25,3 +31,72 @@ def test_docs_accessible(client):
     """Test that API documentation is accessible"""
     response = client.get("/docs")
     assert response.status_code == 200
+
+
+def test_ready_is_503_until_startup_completes(client):
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["reasons"] == ["starting"]
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    probe = ReadinessProbe(interval=5, redis_conn=fakeredis.FakeRedis())
+    db = {"checked_out": 1, "pool_utilization": 0.07, "latency_ms": 2.0}
+    monkeypatch.setattr(probe, "check_db", lambda: dict(db))
+    monkeypatch.setattr(probe, "check_queue", lambda: {"backlog": 3})
+    return probe
+
+
+def test_ready_serves_the_cached_snapshot(client, probe, monkeypatch):
+    monkeypatch.setattr(main, "readiness", probe)
+    monkeypatch.setattr(client.app.state, "ready", True, raising=False)
+    probe.refresh()
+    monkeypatch.setattr(probe, "refresh", lambda: pytest.fail("probed per request"))
+
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ready"] is True
+    assert data["checks"]["queue"] == {"backlog": 3}
+    assert data["checks"]["redis"]["latency_ms"] >= 0
+
+
+def test_thresholds_and_failures_flip_to_not_ready(probe, monkeypatch):
+    probe.max_queue_backlog = 2
+    monkeypatch.setattr(probe, "check_db", lambda: 1 / 0)
+
+    snapshot = probe.refresh()
+
+    assert snapshot["ready"] is False
+    assert snapshot["reasons"] == [
+        "db: ZeroDivisionError: division by zero",
+        "queue: backlog 3 > 2",
+    ]
+
+
+def test_redis_failures_are_only_reported_by_default(probe, monkeypatch):
+    monkeypatch.setattr(probe, "check_redis", lambda: 1 / 0)
+    monkeypatch.setattr(probe, "check_queue", lambda: 1 / 0)
+    monkeypatch.setattr(probe, "check_db", lambda: {"latency_ms": 2.0})
+    probe.max_redis_latency_ms = probe.max_queue_backlog = 0
+
+    snapshot = probe.refresh()
+    assert snapshot["ready"] is True
+    assert snapshot["warnings"] == [
+        "redis: ZeroDivisionError: division by zero",
+        "queue: ZeroDivisionError: division by zero",
+    ]
+
+    probe.redis_required = True
+    assert probe.refresh()["reasons"] == snapshot["warnings"]
+
+
+def test_stale_snapshot_is_not_ready(probe):
+    assert probe.snapshot()["ready"] is False  # nothing checked yet
+    probe.refresh()
+    assert probe.snapshot()["ready"] is True
+
+    probe._snapshot["checked_at"] -= 60
+    assert probe.snapshot()["ready"] is False
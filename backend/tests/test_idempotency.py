@@ -0,0 +1,156 @@
+"""
+Idempotency-Key tests (fakeredis)
+"""
+
+import threading
+import time
+
+import fakeredis
+import orjson
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app import idempotency
+from app.auth import create_access_token
+from app.idempotency import (
+    Idempotency,
+    IdempotencyStore,
+    fingerprint,
+    idempotency_key,
+)
+
+PAYLOAD = {"title": "Write report", "priority": "high"}
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def store(server, monkeypatch):
+    store = IdempotencyStore(
+        fakeredis.FakeRedis(server=server), lock_ttl_ms=5000, wait_ms=2000
+    )
+    monkeypatch.setattr(idempotency, "_store", store)
+    return store
+
+
+@pytest.fixture
+def state():
+    return {"calls": 0, "open": 0, "open_during_run": None, "delay": 0.0}
+
+
+@pytest.fixture
+def client(store, state):
+    """POST /tasks shaped like create_task, with a fake DB dependency"""
+    app = FastAPI()
+    lock = threading.Lock()
+
+    def fake_db():
+        with lock:
+            state["open"] += 1
+        try:
+            yield
+        finally:
+            with lock:
+                state["open"] -= 1
+
+    @app.post("/tasks", status_code=201)
+    def create(
+        body: dict,
+        idempotency: Idempotency = Depends(idempotency_key),
+        db=Depends(fake_db),
+    ):
+        def run() -> bytes:
+            state["calls"] += 1
+            time.sleep(state["delay"])
+            state["open_during_run"] = state["open"]
+            if state.get("fail"):
+                raise HTTPException(status_code=500, detail="boom")
+            return orjson.dumps({"id": state["calls"], **body})
+
+        return idempotency.respond(run)
+
+    return TestClient(app)
+
+
+def post(client, key=None, payload=PAYLOAD, user="user@example.com"):
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user})}"}
+    if key:
+        headers["Idempotency-Key"] = key
+    return client.post("/tasks", json=payload, headers=headers)
+
+
+def test_retry_replays_the_first_response(client, state):
+    first = post(client, "key-1")
+    retry = post(client, "key-1", dict(reversed(PAYLOAD.items())))
+    other_user = post(client, "key-1", user="other@example.com")
+
+    assert state["calls"] == 2  # first request and the other user's
+    assert retry.status_code == first.status_code == 201
+    assert retry.content == first.content
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert other_user.json()["id"] == 2
+
+
+def test_requests_without_a_key_always_run(client, state):
+    post(client)
+    post(client)
+    assert state["calls"] == 2
+
+
+def test_concurrent_duplicates_wait_without_a_db_connection(client, state):
+    state["delay"] = 0.3
+    responses = []
+
+    def request():
+        responses.append(post(client, "key-1"))
+
+    threads = [threading.Thread(target=request) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert state["calls"] == 1
+    assert state["open_during_run"] == 1  # the duplicates held no session
+    assert len({r.content for r in responses}) == 1
+    assert sum("Idempotent-Replayed" in r.headers for r in responses) == 4
+
+
+def test_key_reused_with_another_body_is_rejected(client):
+    post(client, "key-1")
+
+    response = post(client, "key-1", {**PAYLOAD, "priority": "low"})
+    assert response.status_code == 422
+
+
+def test_failed_request_is_not_stored(client, state):
+    state["fail"] = True
+    assert post(client, "key-1").status_code == 500
+
+    state["fail"] = False
+    assert post(client, "key-1").status_code == 201
+    assert state["calls"] == 2
+
+
+def test_duplicate_gives_up_with_409_while_original_runs(client, store, state):
+    store.wait_ms = 50
+    claimed = store.claim("user@example.com", "key-1", fingerprint(PAYLOAD), "original")
+    assert claimed == ("run", None)
+
+    response = post(client, "key-1")
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
+    assert state["calls"] == 0
+
+
+def test_runs_without_redis(client, server, state):
+    server.connected = False
+
+    for _ in range(2):
+        assert post(client, "key-1").status_code == 201
+    assert state["calls"] == 2
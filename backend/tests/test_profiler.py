@@ -0,0 +1,117 @@
+"""
+Sampling profiler tests
+"""
+
+import time
+import uuid
+
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from jose import jwt
+
+from app import auth, revocation
+from app.auth import ALGORITHM, SECRET_KEY, create_access_token, get_current_admin
+from app.middleware import ProfilingMiddleware
+from app.models import User
+from app.profiler import ProfilerBusy, Sampler, is_running
+from app.revocation import RevocationList
+from app.routers import admin
+
+
+def spin(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture
+def revocations(monkeypatch):
+    revocations = RevocationList(fakeredis.FakeRedis(), capacity=1000)
+    monkeypatch.setattr(revocation, "revocations", revocations)
+    yield revocations
+    revocations.stop()
+
+
+@pytest.fixture
+def client(monkeypatch, revocations):
+    monkeypatch.setattr(auth, "ADMIN_EMAILS", {"admin@example.com"})
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(admin.router, prefix="/api")
+    app.dependency_overrides[get_current_admin] = lambda: User(
+        id=uuid.uuid4(), email="admin@example.com"
+    )
+
+    @app.get("/work")
+    def work():
+        spin(0.1)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def admin_headers(email: str = "admin@example.com") -> dict:
+    return {
+        "Authorization": f"Bearer {create_access_token({'sub': email})}",
+        "X-Profile": "1",
+    }
+
+
+def test_sampler_collects_collapsed_stacks():
+    """The busy function shows up in the hottest stacks"""
+    with Sampler(interval=0.001) as sampler:
+        spin(0.1)
+
+    assert sampler.samples > 10
+    top = sampler.collapsed().splitlines()[0]
+    stack, count = top.rsplit(" ", 1)
+    assert "spin (test_profiler.py" in stack
+    assert stack.startswith("MainThread;")
+    assert int(count) > 0
+    assert not is_running()
+
+
+def test_only_one_profile_at_a_time():
+    with Sampler():
+        with pytest.raises(ProfilerBusy):
+            Sampler().start()
+    assert not is_running()
+
+
+def test_profile_endpoint_returns_collapsed_stacks(client):
+    response = client.get("/api/admin/profile?seconds=0.1&interval_ms=1")
+
+    assert response.status_code == 200
+    assert "attachment" in response.headers["Content-Disposition"]
+    assert int(response.headers["X-Profile-Samples"]) > 0
+
+
+def test_profile_header_returns_profile_for_admin(client):
+    """Admins get the request's profile instead of its body"""
+    response = client.get("/work", headers=admin_headers())
+
+    assert response.status_code == 200
+    assert response.headers["X-Profiled-Status"] == "200"
+    assert "spin (test_profiler.py" in response.text
+
+
+def test_profile_header_is_ignored_for_other_users(client):
+    response = client.get("/work", headers=admin_headers("someone@example.com"))
+
+    assert response.json() == {"ok": True}
+    assert "X-Profiled-Status" not in response.headers
+
+
+def test_profile_header_is_ignored_for_revoked_admin_tokens(client, revocations):
+    headers = admin_headers()
+    token = headers["Authorization"].split()[1]
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    revocations.revoke(claims["jti"], claims["exp"])
+
+    response = client.get("/work", headers=headers)
+
+    assert response.json() == {"ok": True}
+    assert "X-Profiled-Status" not in response.headers
@@ -0,0 +1,79 @@
+"""
+Per-request SQL instrumentation tests (in-memory SQLite stands in for Postgres)
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import query_stats
+from app.middleware import RequestLoggingMiddleware
+from app.query_stats import QueryBudget, QueryBudgetExceeded, QueryStats
+
+
+@pytest.fixture
+def client():
+    """App whose routes run a known number of queries"""
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+
+    @app.get("/one", dependencies=[Depends(QueryBudget(1))])
+    def one():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    @app.get("/loop", dependencies=[Depends(QueryBudget(2))])
+    def loop():
+        with engine.connect() as conn:
+            for i in range(8):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_queries_are_counted_in_server_timing(client):
+    """Statements run in the threadpool are attributed to the request"""
+    response = client.get("/one")
+
+    assert response.status_code == 200
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+    assert "app;dur=" in response.headers["Server-Timing"]
+
+
+def test_queries_outside_requests_are_not_collected():
+    """No request context, nothing recorded"""
+    create_engine("sqlite://").connect().execute(text("SELECT 1"))
+    assert query_stats.current_stats() is None
+
+
+def test_repeated_statement_is_flagged():
+    """The same statement over the threshold is an N+1 suspect"""
+    stats = QueryStats()
+    for _ in range(6):
+        stats.record("SELECT * FROM tasks WHERE user_id = %(user_id)s", 1.0)
+    stats.record("SELECT * FROM users", 1.0)
+
+    assert stats.repeated(threshold=5) == [
+        ("SELECT * FROM tasks WHERE user_id = %(user_id)s", 6)
+    ]
+
+
+def test_budget_overrun_warns_by_default(client):
+    """Outside strict mode an overrun is only logged"""
+    response = client.get("/loop")
+
+    assert response.status_code == 200
+    assert 'desc="8 queries"' in response.headers["Server-Timing"]
+
+
+def test_budget_overrun_raises_in_strict_mode(client, monkeypatch):
+    """Strict mode turns an overrun into a test failure"""
+    monkeypatch.setattr(query_stats, "QUERY_BUDGET_STRICT", True)
+
+    assert client.get("/one").status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="8 queries \\(budget 2\\)"):
+        client.get("/loop")
@@ -0,0 +1,148 @@
+"""
+Rate limiting and load shedding tests (fakeredis stands in for Redis)
+"""
+
+import ipaddress
+
+import fakeredis
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app import middleware, ratelimit
+from app.database import PoolWaitTracker
+from app.middleware import LoadSheddingMiddleware
+from app.ratelimit import RateLimit, TokenBucketLimiter
+
+
+@pytest.fixture
+def fake_redis():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def peer():
+    """Socket address requests arrive from (nginx on loopback by default)"""
+    return {"host": "127.0.0.1"}
+
+
+@pytest.fixture
+def limited_client(fake_redis, peer, monkeypatch):
+    """App with one route limited to 3 requests per minute"""
+    monkeypatch.setattr(ratelimit, "limiter", TokenBucketLimiter(fake_redis))
+    app = FastAPI()
+
+    @app.get("/limited", dependencies=[Depends(RateLimit("test", "3/60"))])
+    def limited():
+        return {"ok": True}
+
+    async def from_peer(scope, receive, send):
+        scope["client"] = (peer["host"], 50000)
+        await app(scope, receive, send)
+
+    return TestClient(from_peer)
+
+
+def test_token_bucket_allows_burst_then_denies(fake_redis):
+    """Burst is honoured, then callers are told how long to wait"""
+    limiter = TokenBucketLimiter(fake_redis)
+    results = [limiter.hit("k", rate=1 / 60, burst=3) for _ in range(4)]
+
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+    assert 55 < results[-1][1] <= 60
+
+
+def test_rate_limit_returns_429_with_retry_after(limited_client):
+    """Requests over the limit get 429 and a Retry-After header"""
+    for _ in range(3):
+        assert limited_client.get("/limited").status_code == 200
+
+    response = limited_client.get("/limited")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_rate_limit_is_keyed_per_client(limited_client):
+    """One client exhausting its bucket does not affect another"""
+    for _ in range(4):
+        limited_client.get("/limited", headers={"X-Real-IP": "10.0.0.1"})
+
+    response = limited_client.get("/limited", headers={"X-Real-IP": "10.0.0.2"})
+    assert response.status_code == 200
+
+
+def test_spoofed_real_ip_from_untrusted_peer_is_ignored(limited_client, peer):
+    """A direct client cannot dodge its bucket with a fresh X-Real-IP"""
+    peer["host"] = "203.0.113.7"
+    statuses = [
+        limited_client.get("/limited", headers={"X-Real-IP": f"10.0.0.{i}"})
+        for i in range(4)
+    ]
+
+    assert [r.status_code for r in statuses] == [200, 200, 200, 429]
+    assert limited_client.get("/limited").status_code == 429  # the peer's bucket
+
+
+def test_trusted_proxies_are_configurable(monkeypatch):
+    monkeypatch.setattr(
+        ratelimit, "TRUSTED_PROXIES", [ipaddress.ip_network("172.16.0.0/12")]
+    )
+
+    assert ratelimit.is_trusted_proxy("172.18.0.5")
+    assert not ratelimit.is_trusted_proxy("127.0.0.1")
+    assert not ratelimit.is_trusted_proxy("testclient")
+
+
+def test_rate_limit_fails_open_when_redis_is_down(monkeypatch):
+    """A Redis outage must not reject traffic"""
+    server = fakeredis.FakeServer()
+    server.connected = False
+    monkeypatch.setattr(
+        ratelimit, "limiter", TokenBucketLimiter(fakeredis.FakeRedis(server=server))
+    )
+    app = FastAPI()
+
+    @app.get("/limited", dependencies=[Depends(RateLimit("test", "1/60"))])
+    def limited():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert all(client.get("/limited").status_code == 200 for _ in range(3))
+
+
+def _shedding_client(monkeypatch, **kwargs):
+    monkeypatch.setattr(middleware, "pool_wait", PoolWaitTracker())
+    app = FastAPI()
+
+    @app.get("/work")
+    def work():
+        return {"ok": True}
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    shedder = LoadSheddingMiddleware(app, **kwargs)
+    return shedder, TestClient(shedder)
+
+
+def test_load_shedding_on_in_flight_limit(monkeypatch):
+    """Saturated process answers 503 + Retry-After instead of queueing"""
+    shedder, client = _shedding_client(monkeypatch, max_in_flight=2, retry_after=3)
+    assert client.get("/work").status_code == 200
+
+    shedder.in_flight = 2
+    response = client.get("/work")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+    # Health checks are never shed
+    assert client.get("/health").status_code == 200
+
+
+def test_load_shedding_on_pool_wait(monkeypatch):
+    """Slow DB pool checkouts trigger shedding"""
+    _, client = _shedding_client(monkeypatch, max_pool_wait_ms=100)
+    middleware.pool_wait.observe(5000)
+
+    assert client.get("/work").status_code == 503
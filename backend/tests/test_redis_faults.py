@@ -0,0 +1,157 @@
+"""
+Redis fault injection - a local TCP proxy in front of a fakeredis server
+adds latency, swallows traffic or drops connections
+"""
+
+import socket
+import socketserver
+import threading
+import time
+
+import fakeredis
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError, TimeoutError
+
+from app import ratelimit
+from app.ratelimit import RateLimit, TokenBucketLimiter
+from app.redis_client import CircuitBreaker, CircuitOpenError, create_redis, pool_stats
+
+
+class FaultProxy(socketserver.ThreadingTCPServer):
+    """Forwards to `upstream`; `mode` is pass, latency, blackhole or drop"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, upstream):
+        self.upstream = upstream
+        self.mode = "pass"
+        self.latency = 0.0
+        super().__init__(("127.0.0.1", 0), FaultProxyHandler)
+
+
+class FaultProxyHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        proxy = self.server
+        if proxy.mode == "drop":
+            self.request.close()
+            return
+        upstream = socket.create_connection(proxy.upstream)
+
+        def pump(source, target, delay):
+            try:
+                while chunk := source.recv(65536):
+                    if proxy.mode == "blackhole":
+                        continue
+                    if delay and proxy.mode == "latency":
+                        time.sleep(proxy.latency)
+                    target.sendall(chunk)
+            except OSError:
+                pass
+            finally:
+                target.close()
+
+        threading.Thread(
+            target=pump, args=(upstream, self.request, True), daemon=True
+        ).start()
+        pump(self.request, upstream, False)
+
+
+@pytest.fixture
+def proxy():
+    redis_server = fakeredis.TcpFakeServer(("127.0.0.1", 0))
+    threading.Thread(target=redis_server.serve_forever, daemon=True).start()
+    fault_proxy = FaultProxy(redis_server.server_address)
+    threading.Thread(target=fault_proxy.serve_forever, daemon=True).start()
+    yield fault_proxy
+    fault_proxy.shutdown()
+    redis_server.shutdown()
+
+
+def client_for(proxy, **overrides):
+    host, port = proxy.server_address
+    overrides.setdefault("socket_timeout", 0.2)
+    overrides.setdefault("socket_connect_timeout", 0.2)
+    overrides.setdefault(
+        "breaker", CircuitBreaker(failure_threshold=3, reset_timeout=0.3)
+    )
+    return create_redis(f"redis://{host}:{port}", **overrides)
+
+
+def elapsed(fn) -> float:
+    start = time.perf_counter()
+    try:
+        fn()
+    except (ConnectionError, TimeoutError):
+        pass
+    return time.perf_counter() - start
+
+
+def test_commands_pass_through_the_proxy(proxy):
+    client = client_for(proxy)
+
+    assert client.set("k", "v")
+    assert client.get("k") == b"v"
+    assert pool_stats(client)["in_use"] == 0
+
+
+def test_slow_redis_times_out_instead_of_hanging(proxy):
+    client = client_for(proxy)
+    client.ping()
+    proxy.mode, proxy.latency = "latency", 2.0
+
+    with pytest.raises(TimeoutError):
+        client.get("k")
+    assert elapsed(lambda: client.get("k")) < 1.0
+
+
+def test_breaker_opens_fails_fast_and_recovers(proxy):
+    client = client_for(proxy)
+    client.ping()
+    proxy.mode = "blackhole"
+
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            client.get("k")
+    assert pool_stats(client)["breaker_state"] == "open"
+
+    with pytest.raises(CircuitOpenError):
+        client.get("k")
+    assert elapsed(lambda: client.get("k")) < 0.01
+    assert pool_stats(client)["breaker_rejected"] == 2
+
+    proxy.mode = "pass"
+    time.sleep(0.35)  # reset timeout -> half open, one trial call
+    assert client.ping()
+    assert pool_stats(client)["breaker_state"] == "closed"
+
+
+def test_dropped_connections_count_as_failures(proxy):
+    client = client_for(proxy)
+    proxy.mode = "drop"
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            client.ping()
+    assert client.breaker.state == "open"
+
+
+def test_requests_degrade_gracefully_while_redis_hangs(proxy, monkeypatch):
+    """Rate-limited route keeps answering (fail open), quickly once open"""
+    client = client_for(proxy)
+    monkeypatch.setattr(ratelimit, "limiter", TokenBucketLimiter(client))
+    app = FastAPI()
+
+    @app.get("/limited", dependencies=[Depends(RateLimit("test", "3/60"))])
+    def limited():
+        return {"ok": True}
+
+    http = TestClient(app)
+    proxy.mode = "blackhole"
+    start = time.perf_counter()
+    statuses = [http.get("/limited").status_code for _ in range(10)]
+
+    assert statuses == [200] * 10
+    assert time.perf_counter() - start < 3 * 0.2 + 1.0  # only 3 timeouts paid
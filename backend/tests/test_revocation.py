@@ -0,0 +1,156 @@
+"""
+Token revocation tests (fakeredis stands in for Redis)
+"""
+
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app import auth as auth_module, revocation
+from app.auth import ALGORITHM, SECRET_KEY, create_access_token, get_current_user
+from app.database import get_db
+from app.models import User
+from app.revocation import BloomFilter, RevocationList
+from app.routers import auth
+
+
+class CountingRedis(fakeredis.FakeRedis):
+    """Counts EXISTS calls - the per-request round trip we want to avoid"""
+
+    exists_calls = 0
+
+    def exists(self, *names):
+        type(self).exists_calls += 1
+        return super().exists(*names)
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def synced_list(server) -> RevocationList:
+    revocations = RevocationList(CountingRedis(server=server), capacity=1000)
+    revocations.start()
+    assert revocations.synced.wait(5)
+    return revocations
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    ids = [uuid.uuid4().hex for _ in range(1000)]
+    for jti in ids:
+        bloom.add(jti)
+
+    assert all(jti in bloom for jti in ids)
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+    assert false_positives < 300  # ~1% expected
+
+
+def test_unrevoked_tokens_are_checked_without_redis(server):
+    revocations = synced_list(server)
+    CountingRedis.exists_calls = 0
+
+    assert not any(revocations.is_revoked(uuid.uuid4().hex) for _ in range(100))
+    assert CountingRedis.exists_calls < 3  # only Bloom false positives
+    revocations.stop()
+
+
+def test_revocation_reaches_other_processes(server):
+    """Pub/sub carries a revocation into another process's filter"""
+    here, there = synced_list(server), synced_list(server)
+    jti = uuid.uuid4().hex
+
+    here.revoke(jti, time.time() + 60)
+
+    assert here.is_revoked(jti)
+    assert wait_for(lambda: jti in there.bloom)
+    assert there.is_revoked(jti)
+    here.stop()
+    there.stop()
+
+
+def test_new_process_loads_existing_revocations(server):
+    first = synced_list(server)
+    jti = uuid.uuid4().hex
+    first.revoke(jti, time.time() + 60)
+    first.revoke("expired", time.time() - 1)
+
+    late = synced_list(server)
+    assert jti in late.bloom
+    assert "expired" not in late.bloom
+    first.stop()
+    late.stop()
+
+
+def test_logout_revokes_the_token(server, monkeypatch):
+    revocations = synced_list(server)
+    monkeypatch.setattr(revocation, "revocations", revocations)
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api")
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id=uuid.uuid4(), email="user@example.com"
+    )
+    token = create_access_token({"sub": "user@example.com"})
+    jti = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["jti"]
+
+    response = TestClient(app).post(
+        "/api/auth/logout", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 204
+    assert revocations.is_revoked(jti)
+    revocations.stop()
+
+
+def test_slow_revocation_checks_do_not_block_the_event_loop(monkeypatch):
+    """While one request waits on Redis, others are still served"""
+    monkeypatch.setattr(
+        revocation, "revocations", RevocationList(fakeredis.FakeRedis())
+    )
+    monkeypatch.setattr(RevocationList, "is_revoked", lambda self, jti: time.sleep(0.5))
+    monkeypatch.setattr(
+        auth_module, "get_user_by_email", lambda db, email: User(email=email)
+    )
+    app = FastAPI()
+    app.dependency_overrides[get_db] = lambda: None
+
+    @app.get("/me")
+    def me(user: User = Depends(get_current_user)):
+        return {"email": user.email}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': 'user@example.com'})}"
+    }
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            slow = [pool.submit(client.get, "/me", headers=headers) for _ in range(4)]
+            time.sleep(0.1)  # all four are inside is_revoked now
+            ping_started = time.perf_counter()
+            assert client.get("/ping").status_code == 200
+            ping_ms = (time.perf_counter() - ping_started) * 1000
+            assert all(f.result().status_code == 200 for f in slow)
+        elapsed = time.perf_counter() - start
+
+    assert ping_ms < 200
+    assert elapsed < 1.5  # concurrent, not 4 x 0.5s in a row
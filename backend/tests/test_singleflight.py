@@ -0,0 +1,99 @@
+"""
+Request coalescing tests
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+
+from app import singleflight
+from app.singleflight import RedisSingleFlight, SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    """Ten concurrent callers, one execution, same result for all"""
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def load():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return b"[]"
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        leader = pool.submit(flight.do, "user-1", "list", load)
+        started.wait()
+        followers = [pool.submit(flight.do, "user-1", "list", load) for _ in range(9)]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1
+    assert results == [b"[]"] * 10
+
+
+def test_invalidate_starts_a_new_flight():
+    """Reads issued after a write do not join a flight that predates it"""
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def load_before_write():
+        started.set()
+        release.wait(1)
+        return b"old"
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        before = pool.submit(flight.do, "user-1", "list", load_before_write)
+        started.wait()
+        flight.invalidate("user-1")
+        after = pool.submit(flight.do, "user-1", "list", lambda: b"new")
+
+        assert after.result() == b"new"
+        release.set()
+        assert before.result() == b"old"
+
+
+def test_scopes_are_isolated():
+    """Different users never share results"""
+    flight = SingleFlight()
+    assert flight.do("user-1", "list", lambda: b"1") == b"1"
+    assert flight.do("user-2", "list", lambda: b"2") == b"2"
+
+
+def test_idle_scopes_are_forgotten():
+    """Per-user state lives only while that user has a read in flight"""
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def load():
+        started.set()
+        release.wait(1)
+        return b"[]"
+
+    for user in range(100):
+        flight.do(f"user-{user}", "list", lambda: b"[]")
+        flight.invalidate(f"user-{user}")
+    assert flight._scopes == {}
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        running = pool.submit(flight.do, "user-1", "list", load)
+        started.wait()
+        flight.invalidate("user-1")
+        assert flight._scopes["user-1"].generation == 1
+        release.set()
+        running.result()
+    assert flight._scopes == {}
+
+
+def test_remote_follower_gives_up_after_the_wait(monkeypatch):
+    """A stuck remote leader costs a follower SINGLEFLIGHT_WAIT_MS at most"""
+    monkeypatch.setattr(singleflight, "SINGLEFLIGHT_WAIT_MS", 50)
+    redis_conn = fakeredis.FakeRedis()
+    flight = RedisSingleFlight(redis_conn)
+    redis_conn.set("singleflight:lock:user-1:0:list", "other-leader")
+
+    start = time.perf_counter()
+    assert flight.do("user-1", "list", lambda: b"own") == b"own"
+    assert time.perf_counter() - start < 0.5
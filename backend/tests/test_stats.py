@@ -0,0 +1,172 @@
+"""
+Task statistics counters - the Postgres tests use DATABASE_URL (CI service)
+"""
+
+import uuid
+
+import fakeredis
+import pytest
+from rq import Queue
+from sqlalchemy import text, update
+from sqlalchemy.exc import OperationalError
+
+from app import archive, queue, stats
+from app.database import Base, SessionLocal, engine
+from app.models import ArchivedTask, Task, TaskCounter, User
+from app.models import PriorityEnum as P, StatusEnum as S
+from app.stats import (
+    adjust_task_counter,
+    get_task_stats,
+    move_task_counter,
+    reconcile_task_stats,
+)
+from app.workers.tasks import reconcile_task_stats_job
+
+
+class RecordingSession:
+    """Captures the counter upserts instead of running them"""
+
+    def __init__(self):
+        self.keys = []
+
+    def execute(self, stmt):
+        params = stmt.compile().params
+        self.keys.append((params["status"], params["priority"], params["count"]))
+
+
+def test_opposite_moves_upsert_counters_in_the_same_order():
+    """A: pending -> completed and B: completed -> pending must not deadlock"""
+    user_id = uuid.uuid4()
+    forward, backward = RecordingSession(), RecordingSession()
+
+    move_task_counter(forward, user_id, (S.pending, P.high), (S.completed, P.high))
+    move_task_counter(backward, user_id, (S.completed, P.high), (S.pending, P.high))
+
+    assert [k[:2] for k in forward.keys] == [k[:2] for k in backward.keys]
+    assert forward.keys == [(S.completed, P.high, 1), (S.pending, P.high, -1)]
+
+
+@pytest.fixture(scope="module")
+def database():
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except OperationalError:
+        pytest.skip("needs Postgres at DATABASE_URL")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(database):
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture
+def user_id(db):
+    user = User(email=f"stats-{uuid.uuid4().hex}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    yield user.id
+    db.rollback()
+    # Cascades to the user's tasks, archived tasks and counters
+    db.execute(text("DELETE FROM users WHERE id = :id"), {"id": user.id})
+    db.commit()
+
+
+def add_task(db, user_id, status: S, priority: P) -> Task:
+    task = Task(user_id=user_id, title="t", status=status, priority=priority)
+    db.add(task)
+    adjust_task_counter(db, user_id, status, priority, 1)
+    db.commit()
+    return task
+
+
+def test_stats_follow_task_writes(db, user_id):
+    add_task(db, user_id, S.pending, P.high)
+    add_task(db, user_id, S.pending, P.low)
+    moved = add_task(db, user_id, S.in_progress, P.low)
+
+    move_task_counter(db, user_id, (S.in_progress, P.low), (S.completed, P.high))
+    moved.status, moved.priority = S.completed, P.high
+    db.commit()
+
+    stats = get_task_stats(db, user_id)
+    assert stats == {
+        "total": 3,
+        "by_status": {"pending": 2, "in-progress": 0, "completed": 1},
+        "by_priority": {"low": 1, "medium": 0, "high": 2},
+    }
+
+
+def test_stats_for_user_without_tasks_are_zero(db, user_id):
+    stats = get_task_stats(db, user_id)
+    assert stats["total"] == 0
+    assert set(stats["by_status"].values()) == {0}
+
+
+def test_reconcile_repairs_drift_and_counts_archived_tasks(db, user_id):
+    add_task(db, user_id, S.pending, P.high)
+    db.add(
+        ArchivedTask(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            title="old",
+            status=S.completed,
+            priority=P.low,
+        )
+    )
+    db.execute(
+        update(TaskCounter)
+        .where(TaskCounter.user_id == user_id)
+        .values(count=TaskCounter.count + 5)
+    )
+    db.commit()
+
+    # pending/high was off by 5, completed/low (archived) had no counter
+    assert reconcile_task_stats(db, [user_id]) == 2
+    assert reconcile_task_stats(db, [user_id]) == 0
+    stats = get_task_stats(db, user_id)
+    assert stats["total"] == 2
+    assert stats["by_status"]["completed"] == 1
+
+
+def test_failed_reconcile_still_schedules_the_next(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(stats, "reconcile_all_task_stats", lambda db, **kw: 1 / 0)
+    monkeypatch.setattr(queue, "schedule_reconcile", lambda: scheduled.append(True))
+
+    with pytest.raises(ZeroDivisionError):
+        reconcile_task_stats_job()
+    assert scheduled == [True]
+
+
+def test_startup_schedules_the_reconciliation(monkeypatch):
+    task_queue = Queue("tasks", connection=fakeredis.FakeRedis())
+    monkeypatch.setattr(queue, "get_task_queue", lambda: task_queue)
+    monkeypatch.setattr(queue, "NOTIFICATION_MODE", "immediate")
+
+    queue.schedule_periodic_jobs()
+    queue.schedule_periodic_jobs()  # every deploy: still one job per slot
+
+    run_at = stats.next_run_at()
+    job_id = f"reconcile-{run_at:%Y%m%dT%H%M}"
+    registry = task_queue.scheduled_job_registry
+    assert sorted(registry.get_job_ids()) == [
+        f"archive-{archive.next_run_at():%Y%m%dT%H%M}",
+        job_id,
+    ]
+    assert registry.get_scheduled_time(job_id) == run_at
+    assert task_queue.fetch_job(job_id).retries_left == 3
+
+
+def test_startup_survives_redis_being_down(monkeypatch):
+    server = fakeredis.FakeServer()
+    server.connected = False
+    task_queue = Queue("tasks", connection=fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(queue, "get_task_queue", lambda: task_queue)
+
+    queue.schedule_periodic_jobs()
@@ -0,0 +1,210 @@
+"""
+Task endpoint tests (in-memory SQLite stands in for Postgres)
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.auth import get_current_user
+from app.database import get_db
+from app.models import ArchivedTask, Task, TaskCounter, User
+from app.models import PriorityEnum as P, StatusEnum as S
+from app.replicas import get_read_db
+from app.schemas import MAX_LOOKUP_IDS
+from app.routers.tasks import TASK_FIELDS, router, task_fields
+from app.stats import adjust_task_counter, get_task_stats
+
+
+def test_no_fields_means_all_fields():
+    assert task_fields(None) == TASK_FIELDS
+    assert task_fields("") == TASK_FIELDS
+    assert task_fields(" , ,") == TASK_FIELDS
+
+
+def test_fields_come_back_in_response_order():
+    assert task_fields(" priority,id ,, title,id") == ("id", "title", "priority")
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(HTTPException) as error:
+        task_fields("title,secret,owner")
+
+    assert error.value.status_code == 400
+    assert error.value.detail == "Unknown field(s): owner, secret"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    for model in (User, Task, ArchivedTask, TaskCounter):
+        model.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="owner@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def client(db, user):
+    """The tasks router, signed in as `user`"""
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_read_db] = lambda: db
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def add_task(db, user, title, status=S.pending, priority=P.medium) -> Task:
+    task = Task(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        title=title,
+        status=status,
+        priority=priority,
+    )
+    db.add(task)
+    db.commit()
+    return task
+
+
+def test_list_returns_only_the_requested_fields(client, db, user):
+    add_task(db, user, "Write report", S.in_progress, P.high)
+
+    response = client.get("/tasks", params={"fields": "status,title"})
+
+    assert response.status_code == 200
+    assert response.json() == [{"title": "Write report", "status": "in-progress"}]
+    assert list(response.json()[0]) == ["title", "status"]
+
+
+def test_list_rejects_unknown_fields(client):
+    response = client.get("/tasks", params={"fields": "title,password"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown field(s): password"
+
+
+def test_lookup_keeps_request_order_and_drops_duplicates(client, db, user):
+    first, second = add_task(db, user, "First"), add_task(db, user, "Second")
+    ids = [str(second.id), str(first.id), str(second.id)]
+
+    response = client.post("/tasks/lookup", json={"ids": ids})
+
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()["items"]] == [
+        "Second",
+        "First",
+    ]
+    assert response.json()["missing"] == []
+
+
+def test_lookup_reports_other_users_and_unknown_ids_as_missing(client, db, user):
+    own = add_task(db, user, "Mine")
+    stranger = User(email="stranger@example.com", hashed_password="x")
+    db.add(stranger)
+    db.commit()
+    theirs = add_task(db, stranger, "Theirs")
+    unknown = uuid.uuid4()
+
+    response = client.post(
+        "/tasks/lookup", json={"ids": [str(theirs.id), str(own.id), str(unknown)]}
+    )
+
+    assert [item["id"] for item in response.json()["items"]] == [str(own.id)]
+    assert response.json()["missing"] == [str(theirs.id), str(unknown)]
+
+
+def test_lookup_projection_always_includes_id(client, db, user):
+    task = add_task(db, user, "Mine", priority=P.high)
+
+    response = client.post(
+        "/tasks/lookup", params={"fields": "priority"}, json={"ids": [str(task.id)]}
+    )
+
+    assert response.json()["items"] == [{"id": str(task.id), "priority": "high"}]
+
+
+@pytest.mark.parametrize("count", [0, MAX_LOOKUP_IDS + 1])
+def test_lookup_id_count_is_bounded(client, count):
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+
+    response = client.post("/tasks/lookup", json={"ids": ids})
+
+    assert response.status_code == 422
+
+
+def test_lookup_accepts_the_maximum(client):
+    ids = [str(uuid.uuid4()) for _ in range(MAX_LOOKUP_IDS)]
+
+    response = client.post("/tasks/lookup", json={"ids": ids})
+
+    assert response.status_code == 200
+    assert len(response.json()["missing"]) == MAX_LOOKUP_IDS
+
+
+@pytest.fixture
+def archived(db, user) -> ArchivedTask:
+    """A completed task the archival job has moved, still counted in stats"""
+    task = ArchivedTask(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        title="Old report",
+        status=S.completed,
+        priority=P.low,
+        created_at=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 1, 3, tzinfo=timezone.utc),
+    )
+    db.add(task)
+    adjust_task_counter(db, user.id, S.completed, P.low, 1)
+    db.commit()
+    return task
+
+
+def test_archived_task_can_be_fetched(client, archived):
+    response = client.get(f"/tasks/{archived.id}")
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Old report"
+
+
+def test_archived_task_can_be_deleted(client, db, user, archived):
+    assert client.delete(f"/tasks/{archived.id}").status_code == 204
+
+    assert client.get(f"/tasks/{archived.id}").status_code == 404
+    assert get_task_stats(db, user.id)["total"] == 0
+
+
+def test_archived_task_cannot_be_updated(client, archived):
+    response = client.patch(f"/tasks/{archived.id}", json={"title": "New"})
+
+    assert response.status_code == 409
+    assert client.get(f"/tasks/{archived.id}").json()["title"] == "Old report"
+
+
+def test_live_task_delete_updates_stats(client, db, user):
+    task = add_task(db, user, "Mine")
+    adjust_task_counter(db, user.id, S.pending, P.medium, 1)
+    db.commit()
+
+    assert client.delete(f"/tasks/{task.id}").status_code == 204
+    assert client.get(f"/tasks/{task.id}").status_code == 404
+    assert get_task_stats(db, user.id)["total"] == 0